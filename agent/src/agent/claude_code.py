@@ -21,113 +21,261 @@ import re
 import threading
 from pathlib import Path
 from urllib.parse import urlparse
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from loguru import logger
 
 from storage.entity.dto import Message, VmConfig
-from storage.util import generate_message_id, get_utc_iso8601_timestamp, get_unix_timestamp
+from storage.dto.chat import strip_invisible
+from storage.util import (
+    generate_message_id,
+    get_message_timestamps,
+    get_utc_iso8601_timestamp,
+    get_unix_timestamp,
+)
 from agent.poll_loop import PollLoop
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None
+
+
+# stream-json decoding dominates CPU on long live sessions and bulk history
+# imports; orjson parses bytes directly and is several times faster.
+if orjson is not None:
+    _loads = orjson.loads
+
+    # Compact UTF-8 output; int/float/bool keys are stringified like json.dumps.
+    _DUMPS_OPTS = orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj) -> str:
+        try:
+            return orjson.dumps(obj, option=_DUMPS_OPTS).decode("utf-8")
+        except TypeError:
+            # orjson rejects ints beyond 64 bits
+            return json.dumps(obj)
+
+    def _dumps_bytes(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, option=_DUMPS_OPTS)
+        except TypeError:
+            return json.dumps(obj).encode("utf-8")
+else:
+    _loads = json.loads
+    _dumps = json.dumps
+
+    def _dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 
 # ---------------------------------------------------------------------------
 # Stream-json message converters
 # ---------------------------------------------------------------------------
 
-def _convert_assistant(obj: Dict, tool_use_index: Dict[str, Dict]) -> Optional[Message]:
-    """Convert a stream-json assistant object to a y-agent Message."""
-    message = obj.get("message", {})
-    content_blocks = message.get("content", [])
-    model = message.get("model")
-    uuid = obj.get("uuid")
+# tool_use_index maps tool_use id -> (name, input); unresolved ids fall back here.
+_UNKNOWN_TOOL_USE = (None, None)
+
+
+def _join_parts(parts: List[str]) -> str:
+    """Newline-join text/thinking parts; most messages carry exactly one."""
+    if len(parts) == 1:
+        return parts[0]
+    return "\n".join(parts) if parts else ""
+
+
+def _split_assistant_blocks(
+    content_blocks: List[Dict],
+    tool_use_index: Dict[str, Tuple[str, Dict]],
+) -> Tuple[str, Optional[str], List[Dict]]:
+    """Split assistant content blocks into (content, reasoning, tool_calls).
+
+    Registers each tool_use in ``tool_use_index``. A lone text block (the
+    common streamed case) returns without building any part lists.
+    """
+    if len(content_blocks) == 1:
+        block = content_blocks[0]
+        if block.get("type") == "text":
+            return block.get("text", ""), None, []
 
     text_parts = []
     thinking_parts = []
     tool_calls = []
+    # Bound once per message: this runs for every block of every line.
+    append_text = text_parts.append
+    append_thinking = thinking_parts.append
+    append_tool_call = tool_calls.append
 
     for block in content_blocks:
-        block_type = block.get("type")
+        get = block.get
+        block_type = get("type")
         if block_type == "text":
-            text_parts.append(block.get("text", ""))
+            append_text(get("text", ""))
         elif block_type == "thinking":
-            thinking_parts.append(block.get("thinking", ""))
+            append_thinking(get("thinking", ""))
         elif block_type == "tool_use":
-            tool_id = block.get("id")
-            tool_name = block.get("name")
-            tool_input = block.get("input", {})
-            tool_use_index[tool_id] = {"name": tool_name, "input": tool_input}
-            tool_calls.append({
+            tool_id = get("id")
+            tool_name = get("name")
+            tool_input = get("input", {})
+            tool_use_index[tool_id] = (tool_name, tool_input)
+            append_tool_call({
                 "id": tool_id,
                 "type": "function",
-                "function": {
-                    "name": tool_name,
-                    "arguments": json.dumps(tool_input),
-                },
+                "function": {"name": tool_name, "arguments": _dumps(tool_input)},
                 "status": "approved",
             })
 
-    content = "\n".join(text_parts)
-    reasoning = "\n".join(thinking_parts) if thinking_parts else None
+    content = _join_parts(text_parts)
+    reasoning = _join_parts(thinking_parts) if thinking_parts else None
+    return content, reasoning, tool_calls
+
+
+def _convert_assistant(
+    obj: Dict,
+    tool_use_index: Dict[str, Tuple[str, Dict]],
+    ts: Optional[str] = None,
+    unix_ts: Optional[int] = None,
+    parent_id: Optional[str] = None,
+) -> Optional[Message]:
+    """Convert a stream-json assistant object to a y-agent Message.
+
+    Batch converters pass ``ts``/``unix_ts`` computed once for the whole import;
+    live callers omit them and get the current time. ``parent_id`` is set on
+    the Message as it is built.
+    """
+    message = obj.get("message", {})
+    content_blocks = message.get("content", [])
+    model = message.get("model")
+    uuid = obj.get("uuid")
+
+    content, reasoning, tool_calls = _split_assistant_blocks(content_blocks, tool_use_index)
 
     if not content and not reasoning and not tool_calls:
         return None
 
-    return Message.from_dict({
-        "role": "assistant",
-        "content": content,
-        "reasoning_content": reasoning,
-        "timestamp": get_utc_iso8601_timestamp(),
-        "unix_timestamp": get_unix_timestamp(),
-        "id": uuid or generate_message_id(),
-        "model": model,
-        "provider": "claude_code",
-        "tool_calls": tool_calls if tool_calls else None,
-    })
-
-
-def _convert_user_tool_results(obj: Dict, tool_use_index: Dict[str, Dict]) -> List[Message]:
-    """Convert a stream-json user object (tool results) to y-agent tool Messages."""
+    if not ts or not unix_ts:
+        now_ts, now_unix = get_message_timestamps()
+        ts = ts or now_ts
+        unix_ts = unix_ts or now_unix
+
+    return Message(
+        role="assistant",
+        content=strip_invisible(content),
+        reasoning_content=reasoning,
+        timestamp=ts,
+        unix_timestamp=unix_ts,
+        id=uuid or generate_message_id(),
+        parent_id=parent_id,
+        model=model,
+        provider="claude_code",
+        tool_calls=tool_calls if tool_calls else None,
+        telegram_delivered_images=[],
+    )
+
+
+def _convert_user_tool_results(
+    obj: Dict,
+    tool_use_index: Dict[str, Tuple[str, Dict]],
+    ts: Optional[str] = None,
+    unix_ts: Optional[int] = None,
+    parent_id: Optional[str] = None,
+) -> List[Message]:
+    """Convert a stream-json user object (tool results) to y-agent tool Messages.
+
+    ``ts``/``unix_ts`` default to the current time, taken once per object.
+    The first result keeps the envelope uuid as its id; later results in the
+    same envelope get ``<uuid>_<n>`` so ids stay unique for parent_id walks.
+    The results are chained as they are built: the first links to
+    ``parent_id``, each later one to the result before it.
+    """
     message = obj.get("message", {})
     content_blocks = message.get("content", [])
+    if ts is None or unix_ts is None:
+        now_ts, now_unix = get_message_timestamps()
+        if ts is None:
+            ts = now_ts
+        if unix_ts is None:
+            unix_ts = now_unix
+    base_uuid = obj.get("uuid")
 
     messages = []
+    append = messages.append
+    lookup = tool_use_index.get
     for block in content_blocks:
-        if block.get("type") != "tool_result":
+        if not isinstance(block, dict):
+            continue
+        get = block.get
+        if get("type") != "tool_result":
             continue
 
-        tool_call_id = block.get("tool_use_id")
-        result_content = block.get("content", "")
-
-        tool_info = tool_use_index.get(tool_call_id, {})
-        tool_name = tool_info.get("name")
-        tool_args = tool_info.get("input")
-
-        msg = Message.from_dict({
-            "role": "tool",
-            "content": result_content if isinstance(result_content, str) else json.dumps(result_content),
-            "timestamp": get_utc_iso8601_timestamp(),
-            "unix_timestamp": get_unix_timestamp(),
-            "id": obj.get("uuid") or generate_message_id(),
-            "tool": tool_name,
-            "arguments": tool_args,
-            "tool_call_id": tool_call_id,
-        })
-        messages.append(msg)
+        tool_call_id = get("tool_use_id")
+        result_content = get("content", "")
+
+        tool_name, tool_args = lookup(tool_call_id, _UNKNOWN_TOOL_USE)
+        if not base_uuid:
+            msg_id = generate_message_id()
+        elif messages:
+            msg_id = f"{base_uuid}_{len(messages)}"
+        else:
+            msg_id = base_uuid
+
+        append(Message(
+            role="tool",
+            content=strip_invisible(result_content if type(result_content) is str else _dumps(result_content)),
+            timestamp=ts,
+            unix_timestamp=unix_ts,
+            id=msg_id,
+            parent_id=parent_id,
+            tool=tool_name,
+            arguments=tool_args,
+            tool_call_id=tool_call_id,
+            telegram_delivered_images=[],
+        ))
+        parent_id = msg_id
 
     return messages
 
 
-def parse_stream_line(line: str) -> Optional[Dict]:
-    """Parse a single stream-json line into a dict. Returns None on parse failure."""
-    line = line.strip()
+def parse_stream_line(line: Union[str, bytes]) -> Optional[Dict]:
+    """Parse a single stream-json line (str or raw bytes) into a dict.
+    Returns None on parse failure.
+
+    No ``strip()``: both decoders skip surrounding whitespace (including the
+    trailing newline), and blank lines fall through to the failure path.
+    """
     if not line:
         return None
+    try:
+        return _loads(line)
+    except ValueError:
+        # JSONDecodeError, or UnicodeDecodeError for undecodable raw bytes
+        if orjson is None:
+            return None
+    # orjson is stricter than the stdlib (e.g. NaN/Infinity literals); keep
+    # accepting whatever json.loads did before
     try:
         return json.loads(line)
-    except json.JSONDecodeError:
+    except ValueError:
         return None
 
 
+# claude's stream-json always writes "type" as the first key, compactly.
+_TYPE_PREFIX = b'{"type":"'
+_TYPE_START = len(_TYPE_PREFIX)
+# Types the live tail acts on; everything else is dropped unparsed.
+_TAIL_TYPES = frozenset((b"assistant", b"user", b"result", b"system"))
+_SESSION_ID_RE = re.compile(rb'"session_id":"([^"]*)"')
+
+
+def _peek_stream_type(line: bytes) -> Optional[bytes]:
+    """Return the raw ``type`` value of a stream-json line, or None if the
+    line does not start with the expected ``{"type":"...`` prefix."""
+    if not line.startswith(_TYPE_PREFIX):
+        return None
+    end = line.find(b'"', _TYPE_START)
+    return line[_TYPE_START:end] if end != -1 else None
+
+
 # ---------------------------------------------------------------------------
 # Batch converters (for importing existing data)
 # ---------------------------------------------------------------------------
@@ -135,7 +283,13 @@ def parse_stream_line(line: str) -> Optional[Dict]:
 def convert_stream_messages(stream_lines: List[str]) -> List[Message]:
     """Convert a list of stream-json lines into y-agent Messages."""
     messages: List[Message] = []
-    tool_use_index: Dict[str, Dict] = {}
+    tool_use_index: Dict[str, Tuple[str, Dict]] = {}
+    append = messages.append
+    extend = messages.extend
+    # parent_ids are set as each Message is built (no second pass)
+    last_id: Optional[str] = None
+    # One import, one timestamp
+    ts, unix_ts = get_message_timestamps()
 
     for line in stream_lines:
         obj = parse_stream_line(line)
@@ -143,28 +297,44 @@ def convert_stream_messages(stream_lines: List[str]) -> List[Message]:
             continue
         msg_type = obj.get("type")
         if msg_type == "assistant":
-            msg = _convert_assistant(obj, tool_use_index)
+            msg = _convert_assistant(obj, tool_use_index, ts, unix_ts, parent_id=last_id)
             if msg:
-                messages.append(msg)
+                last_id = msg.id
+                append(msg)
         elif msg_type == "user":
-            messages.extend(_convert_user_tool_results(obj, tool_use_index))
+            msgs = _convert_user_tool_results(obj, tool_use_index, ts, unix_ts, parent_id=last_id)
+            if msgs:
+                last_id = msgs[-1].id
+                extend(msgs)
 
-    for i in range(1, len(messages)):
-        messages[i].parent_id = messages[i - 1].id
     return messages
 
 
+# User lines from slash commands / local command output, not real prompts
+_SKIP_USER_PREFIXES = ("<command-name>", "<command-message>", "<local-command")
 
-def convert_history_session(jsonl_lines: List[str]) -> Tuple[List[Message], Optional[str], Optional[str]]:
+# Byte-level forms of the same filters, as Claude Code serializes them
+# (compact JSON). A raw '"' can't occur inside a JSON string, so these only
+# match real keys.
+_META_MARKERS = (b'"isMeta":true', b'"isSidechain":true')
+_COMMAND_USER_MARKER = b'"role":"user","content":"<'
+_COMMAND_USER_RE = re.compile(
+    rb'"role":"user","content":"<(?:command-name>|command-message>|local-command)'
+)
+
+
+def convert_history_session(jsonl_lines: Iterable[Union[str, bytes]]) -> Tuple[List[Message], Optional[str], Optional[str]]:
     """Convert Claude Code history JSONL (from ~/.claude/projects/) into y-agent Messages.
 
     History JSONL differs from stream-json: each line has exactly ONE content block,
     so consecutive assistant lines must be merged into a single Message.
+    ``jsonl_lines`` is consumed once, so a file opened in binary mode can be
+    passed directly and is read a line at a time.
 
     Returns (messages, session_id, work_dir).
     """
     messages: List[Message] = []
-    tool_use_index: Dict[str, Dict] = {}
+    tool_use_index: Dict[str, Tuple[str, Dict]] = {}
     session_id: Optional[str] = None
     work_dir: Optional[str] = None
 
@@ -173,6 +343,13 @@ def convert_history_session(jsonl_lines: List[str]) -> Tuple[List[Message], Opti
     pending_assistant_model: Optional[str] = None
     pending_assistant_uuid: Optional[str] = None
     pending_assistant_ts: Optional[str] = None
+    last_id: Optional[str] = None
+
+    def _append(msg: Message) -> None:
+        """Append a message built with ``parent_id=last_id`` and advance last_id."""
+        nonlocal last_id
+        last_id = msg.id
+        messages.append(msg)
 
     def _flush_assistant():
         """Flush accumulated assistant blocks into a single Message."""
@@ -180,33 +357,7 @@ def convert_history_session(jsonl_lines: List[str]) -> Tuple[List[Message], Opti
         if not pending_assistant_blocks:
             return
 
-        text_parts = []
-        thinking_parts = []
-        tool_calls = []
-
-        for block in pending_assistant_blocks:
-            block_type = block.get("type")
-            if block_type == "text":
-                text_parts.append(block.get("text", ""))
-            elif block_type == "thinking":
-                thinking_parts.append(block.get("thinking", ""))
-            elif block_type == "tool_use":
-                tool_id = block.get("id")
-                tool_name = block.get("name")
-                tool_input = block.get("input", {})
-                tool_use_index[tool_id] = {"name": tool_name, "input": tool_input}
-                tool_calls.append({
-                    "id": tool_id,
-                    "type": "function",
-                    "function": {
-                        "name": tool_name,
-                        "arguments": json.dumps(tool_input),
-                    },
-                    "status": "approved",
-                })
-
-        content = "\n".join(text_parts)
-        reasoning = "\n".join(thinking_parts) if thinking_parts else None
+        content, reasoning, tool_calls = _split_assistant_blocks(pending_assistant_blocks, tool_use_index)
         ts = pending_assistant_ts or get_utc_iso8601_timestamp()
 
         if not content and not reasoning and not tool_calls:
@@ -216,17 +367,19 @@ def convert_history_session(jsonl_lines: List[str]) -> Tuple[List[Message], Opti
             pending_assistant_ts = None
             return
 
-        messages.append(Message.from_dict({
-            "role": "assistant",
-            "content": content,
-            "reasoning_content": reasoning,
-            "timestamp": ts,
-            "unix_timestamp": _iso_to_unix_ms(ts),
-            "id": pending_assistant_uuid or generate_message_id(),
-            "model": pending_assistant_model,
-            "provider": "claude_code",
-            "tool_calls": tool_calls if tool_calls else None,
-        }))
+        _append(Message(
+            role="assistant",
+            content=strip_invisible(content),
+            reasoning_content=reasoning,
+            timestamp=ts,
+            unix_timestamp=_iso_to_unix_ms(ts),
+            id=pending_assistant_uuid or generate_message_id(),
+            parent_id=last_id,
+            model=pending_assistant_model,
+            provider="claude_code",
+            tool_calls=tool_calls if tool_calls else None,
+            telegram_delivered_images=[],
+        ))
 
         pending_assistant_blocks = []
         pending_assistant_model = None
@@ -234,6 +387,16 @@ def convert_history_session(jsonl_lines: List[str]) -> Tuple[List[Message], Opti
         pending_assistant_ts = None
 
     for line in jsonl_lines:
+        # Raw-bytes prefilter: drop meta/sidechain and command echo lines
+        # without parsing them. Misses (other key order, str input) just
+        # take the normal path below.
+        if type(line) is bytes:
+            if _META_MARKERS[0] in line or _META_MARKERS[1] in line:
+                continue
+            if _COMMAND_USER_MARKER in line and _COMMAND_USER_RE.search(line):
+                _flush_assistant()
+                continue
+
         obj = parse_stream_line(line)
         if not obj:
             continue
@@ -268,44 +431,50 @@ def convert_history_session(jsonl_lines: List[str]) -> Tuple[List[Message], Opti
 
             message = obj.get("message", {})
             content = message.get("content", "")
-            ts = obj.get("timestamp", get_utc_iso8601_timestamp())
+            # History lines carry their own timestamp; only format "now" when missing
+            ts = obj["timestamp"] if "timestamp" in obj else get_utc_iso8601_timestamp()
+
+            # Decoded JSON: plain str/list, never subclasses
+            content_type = type(content)
+            is_text = content_type is str
 
             # Skip command/system user messages
-            if isinstance(content, str) and (
-                content.startswith("<command-name>") or content.startswith("<command-message>")
-                or content.startswith("<local-command")
-            ):
+            if is_text and content.startswith(_SKIP_USER_PREFIXES):
                 continue
 
-            if isinstance(content, list) and any(
-                isinstance(b, dict) and b.get("type") == "tool_result" for b in content
-            ):
-                tool_msgs = _convert_user_tool_results(obj, tool_use_index)
-                # Override timestamps from JSONL (the helper uses current time)
-                unix_ts = _iso_to_unix_ms(ts)
-                for tm in tool_msgs:
-                    tm.timestamp = ts
-                    tm.unix_timestamp = unix_ts
-                messages.extend(tool_msgs)
-            elif isinstance(content, str) and content.strip():
+            has_tool_result = False
+            if content_type is list:
+                for block in content:
+                    if isinstance(block, dict) and block.get("type") == "tool_result":
+                        has_tool_result = True
+                        break
+
+            if has_tool_result:
+                # Stamp tool results with the JSONL timestamp; they arrive
+                # already chained onto last_id
+                tool_msgs = _convert_user_tool_results(
+                    obj, tool_use_index, ts, _iso_to_unix_ms(ts), parent_id=last_id,
+                )
+                if tool_msgs:
+                    last_id = tool_msgs[-1].id
+                    messages.extend(tool_msgs)
+            elif is_text and content.strip():
                 # Strip system-injected XML tags
                 cleaned = _strip_system_xml(content)
                 if cleaned.strip():
-                    messages.append(Message.from_dict({
-                        "role": "user",
-                        "content": cleaned,
-                        "timestamp": ts,
-                        "unix_timestamp": _iso_to_unix_ms(ts),
-                        "id": obj.get("uuid") or generate_message_id(),
-                    }))
+                    _append(Message(
+                        role="user",
+                        content=strip_invisible(cleaned),
+                        timestamp=ts,
+                        unix_timestamp=_iso_to_unix_ms(ts),
+                        id=obj.get("uuid") or generate_message_id(),
+                        parent_id=last_id,
+                        telegram_delivered_images=[],
+                    ))
 
     # Flush any trailing assistant blocks
     _flush_assistant()
 
-    # Link parent_ids
-    for i in range(1, len(messages)):
-        messages[i].parent_id = messages[i - 1].id
-
     return messages, session_id, work_dir
 
 
@@ -344,32 +513,30 @@ class StreamConverter:
     """Stateful line-by-line converter that links parent_ids across lines."""
 
     def __init__(self, last_message_id: Optional[str] = None):
-        self.tool_use_index: Dict[str, Dict] = {}
+        self.tool_use_index: Dict[str, Tuple[str, Dict]] = {}
         self.last_message_id = last_message_id
 
-    def process_line(self, line: str) -> List[Message]:
+    def process_line(self, line: Union[str, bytes]) -> List[Message]:
         obj = parse_stream_line(line)
         if not obj:
             return []
+        return self.process_obj(obj)
 
+    def process_obj(self, obj: Dict) -> List[Message]:
+        """Convert an already-parsed stream-json object (see `process_line`)."""
         msg_type = obj.get("type")
-        messages: List[Message] = []
-
         if msg_type == "assistant":
-            msg = _convert_assistant(obj, self.tool_use_index)
+            msg = _convert_assistant(obj, self.tool_use_index, parent_id=self.last_message_id)
             if not msg:
                 return []
-            msg.parent_id = self.last_message_id
             self.last_message_id = msg.id
-            messages.append(msg)
-        elif msg_type == "user":
-            msgs = _convert_user_tool_results(obj, self.tool_use_index)
-            for msg in msgs:
-                msg.parent_id = self.last_message_id
-                self.last_message_id = msg.id
-            messages.extend(msgs)
-
-        return messages
+            return [msg]
+        if msg_type == "user":
+            msgs = _convert_user_tool_results(obj, self.tool_use_index, parent_id=self.last_message_id)
+            if msgs:
+                self.last_message_id = msgs[-1].id
+            return msgs
+        return []
 
 
 # ---------------------------------------------------------------------------
@@ -409,9 +576,14 @@ def _claude_resume_session_id(cmd: List[str]) -> Optional[str]:
 
 def _ssh_exec(client, cmd: str) -> str:
     """Execute a command via SSH and return stdout. Raises on non-zero exit."""
+    return _ssh_exec_bytes(client, cmd).decode("utf-8", errors="replace")
+
+
+def _ssh_exec_bytes(client, cmd: str) -> bytes:
+    """`_ssh_exec` without decoding stdout, for byte-offset bookkeeping."""
     stdin, stdout, stderr = client.exec_command(cmd)
     exit_code = stdout.channel.recv_exit_status()
-    output = stdout.read().decode("utf-8", errors="replace")
+    output = stdout.read()
     if exit_code != 0:
         err = stderr.read().decode("utf-8", errors="replace")
         if "no server running" not in err and "session not found" not in err:
@@ -553,6 +725,13 @@ def _pkill_tail_cmd(chat_id: str) -> str:
     return f"pkill -f {_shell_quote(pattern)} 2>/dev/null"
 
 
+# Read size for the tail channel. paramiko's readline pulls `bufsize` bytes per
+# recv and re-scans the accumulated line after each one, so the default 8 KiB
+# turns a single large stream-json line (big tool results) into many
+# small reads and quadratic re-scans.
+_TAIL_READ_BUFSIZE = 1 << 16
+
+
 def _build_tail_cmd(stdout_file: str, exit_file: str, offset: int) -> str:
     """Build the remote tail + watcher command for tailing a detached turn.
 
@@ -624,16 +803,19 @@ def _claude_write_stdin(client, chat_id: str, prompt: str, images: Optional[List
     for image_path in images or []:
         content.append(_claude_image_block(image_path, client))
 
-    payload = json.dumps({
+    # Encode straight to bytes: image blocks make this payload MBs of base64.
+    payload = _dumps_bytes({
         "type": "user",
         "message": {
             "role": "user",
             "content": content,
         },
-    }) + "\n"
+    }) + b"\n"
     sftp = client.open_sftp()
     try:
-        with sftp.open(f"/tmp/cc-{chat_id}.stdin", "w") as f:
+        with sftp.open(f"/tmp/cc-{chat_id}.stdin", "wb") as f:
+            # Don't wait for a server ack on every 32 KiB SFTP write request
+            f.set_pipelined(True)
             f.write(payload)
     finally:
         sftp.close()
@@ -721,12 +903,18 @@ async def tail_ssh_output(
     check_deadline_fn: Optional[Callable[[], bool]] = None,
     ssh_client=None,
     check_steer_fn: Optional[Callable[[], List[Tuple[str, str, list]]]] = None,
+    message_batch_callback: Optional[Callable[[List[Message]], None]] = None,
 ) -> dict:
     """Tail a detached claude-code process's stdout file via SSH.
 
     If ssh_client is provided, reuses that connection (from a pool).
     Otherwise creates and closes its own connection.
 
+    When `message_batch_callback` is given it receives all Messages converted
+    from one stdout line at once (e.g. every tool_result of a parallel tool
+    call), so the caller can persist them in a single write; otherwise
+    `message_callback` is invoked per Message.
+
     Returns dict with:
       - offset: new line offset
       - last_message_id: last processed message id
@@ -770,7 +958,10 @@ async def tail_ssh_output(
         # tail from offset, follow until exit file appears or deadline/interrupt
         tail_cmd = _build_tail_cmd(stdout_file, exit_file, offset)
 
-        stdin_ch, stdout_ch, stderr_ch = client.exec_command(tail_cmd)
+        stdin_ch, stdout_ch, stderr_ch = client.exec_command(tail_cmd, bufsize=_TAIL_READ_BUFSIZE)
+        # exec_command's stdout file decodes every line to str; reopen the
+        # channel in binary mode so lines reach the parser as raw bytes.
+        stdout_ch = stdout_ch.channel.makefile("rb", _TAIL_READ_BUFSIZE)
 
         def _kill_detached():
             logger.info("interrupt watchdog (detached): killing tmux session cc-{}", chat_id)
@@ -878,26 +1069,45 @@ async def tail_ssh_output(
                         stdout_ch.channel.close()
                         return "deadline"
 
-                    line = raw_line.strip() if isinstance(raw_line, str) else raw_line.decode("utf-8", errors="replace").strip()
+                    # Raw bytes go straight to the parser (orjson decodes UTF-8 itself)
+                    line = raw_line.strip()
                     if not line:
                         continue
 
                     current_offset += 1
 
+                    # Skip the full parse for lines only read for their type
+                    # or session id (system init carries the whole tool list).
+                    if type(line) is bytes:
+                        peeked = _peek_stream_type(line)
+                        if peeked is not None:
+                            if peeked not in _TAIL_TYPES:
+                                continue
+                            if peeked == b"system":
+                                m = _SESSION_ID_RE.search(line)
+                                if m:
+                                    session_id = m.group(1).decode("utf-8")
+                                    continue
+
                     obj = parse_stream_line(line)
                     if not obj:
                         continue
 
-                    if obj.get("type") == "system":
+                    obj_type = obj.get("type")
+                    if obj_type == "system":
                         session_id = obj.get("session_id")
                         continue
-                    if obj.get("type") == "result":
+                    if obj_type == "result":
                         result_data = obj
                         _kill_tmux()
                         return None
 
-                    if message_callback:
-                        for msg in converter.process_line(line):
+                    if message_batch_callback:
+                        msgs = converter.process_obj(obj)
+                        if msgs:
+                            message_batch_callback(msgs)
+                    elif message_callback:
+                        for msg in converter.process_obj(obj):
                             message_callback(msg)
             except (OSError, EOFError, Exception) as e:
                 if check_interrupted_fn and check_interrupted_fn():
@@ -20,8 +20,9 @@ from typing import Callable, Dict, List, Optional
 
 from loguru import logger
 
+from storage.dto.chat import strip_invisible
 from storage.entity.dto import Message
-from storage.util import generate_message_id, get_utc_iso8601_timestamp, get_unix_timestamp
+from storage.util import generate_message_id, get_message_timestamps
 from agent.claude_code import (
     parse_stream_line,
     _parse_ssh_target,
@@ -126,6 +127,34 @@ def _file_change_summary(item: Dict) -> str:
     return f"changed {path}".strip() if path else "file changed"
 
 
+def _codex_message(role: str, content, **fields) -> Message:
+    """Build a codex Message directly instead of via ``Message.from_dict``.
+
+    Skips the intermediate dict and the key re-walk in ``from_dict`` while
+    keeping its normalization (invisible-char strip, empty delivered images).
+    """
+    if type(content) is str:
+        content = strip_invisible(content)
+    ts, unix_ts = get_message_timestamps()
+    return Message(
+        role=role,
+        content=content,
+        timestamp=ts,
+        unix_timestamp=unix_ts,
+        id=generate_message_id(),
+        telegram_delivered_images=[],
+        **fields,
+    )
+
+
+def _tool_call(call_id: str, name: str, arguments: str) -> Dict:
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": arguments},
+        "status": "approved",
+    }
+
 class CodexStreamConverter:
     """Stateful JSONL event converter that maps Codex events to y-agent Messages."""
 
@@ -146,7 +175,10 @@ class CodexStreamConverter:
         obj = parse_stream_line(line)
         if not obj:
             return []
+        return self.process_obj(obj)
 
+    def process_obj(self, obj: Dict) -> List[Message]:
+        """Convert an already-parsed Codex event (see `process_line`)."""
         event_type = obj.get("type")
         messages: List[Message] = []
 
@@ -161,45 +193,19 @@ class CodexStreamConverter:
             if item_type == "command_execution":
                 command = _strip_shell_wrapper(item.get("command", ""))
                 self._pending_items[item_id] = item_id
-                msg = Message.from_dict({
-                    "role": "assistant",
-                    "content": "",
-                    "timestamp": get_utc_iso8601_timestamp(),
-                    "unix_timestamp": get_unix_timestamp(),
-                    "id": generate_message_id(),
-                    "provider": "codex",
-                    "tool_calls": [{
-                        "id": item_id,
-                        "type": "function",
-                        "function": {
-                            "name": "Bash",
-                            "arguments": json.dumps({"command": command}),
-                        },
-                        "status": "approved",
-                    }],
-                })
+                msg = _codex_message(
+                    "assistant", "", provider="codex",
+                    tool_calls=[_tool_call(item_id, "Bash", json.dumps({"command": command}))],
+                )
                 messages.append(self._emit(msg))
 
             elif item_type == "file_change":
                 arguments = _file_change_arguments(item)
                 self._pending_items[item_id] = item_id
-                msg = Message.from_dict({
-                    "role": "assistant",
-                    "content": "",
-                    "timestamp": get_utc_iso8601_timestamp(),
-                    "unix_timestamp": get_unix_timestamp(),
-                    "id": generate_message_id(),
-                    "provider": "codex",
-                    "tool_calls": [{
-                        "id": item_id,
-                        "type": "function",
-                        "function": {
-                            "name": "Edit",
-                            "arguments": json.dumps(arguments),
-                        },
-                        "status": "approved",
-                    }],
-                })
+                msg = _codex_message(
+                    "assistant", "", provider="codex",
+                    tool_calls=[_tool_call(item_id, "Edit", json.dumps(arguments))],
+                )
                 messages.append(self._emit(msg))
 
         elif event_type == "item.completed":
@@ -213,58 +219,32 @@ class CodexStreamConverter:
             if item_type == "agent_message":
                 text = item.get("text", "")
                 if text:
-                    msg = Message.from_dict({
-                        "role": "assistant",
-                        "content": text,
-                        "timestamp": get_utc_iso8601_timestamp(),
-                        "unix_timestamp": get_unix_timestamp(),
-                        "id": generate_message_id(),
-                        "provider": "codex",
-                    })
+                    msg = _codex_message("assistant", text, provider="codex")
                     messages.append(self._emit(msg))
 
             elif item_type == "command_execution":
                 output = _command_output(item)
                 command = _strip_shell_wrapper(item.get("command", ""))
-                msg = Message.from_dict({
-                    "role": "tool",
-                    "content": output,
-                    "timestamp": get_utc_iso8601_timestamp(),
-                    "unix_timestamp": get_unix_timestamp(),
-                    "id": generate_message_id(),
-                    "tool": "Bash",
-                    "arguments": {"command": command},
-                    "tool_call_id": tool_call_id,
-                })
+                msg = _codex_message(
+                    "tool", output, tool="Bash",
+                    arguments={"command": command}, tool_call_id=tool_call_id,
+                )
                 messages.append(self._emit(msg))
 
             elif item_type == "file_change":
                 content = item.get("diff", "") or item.get("content", "") or _file_change_summary(item)
                 arguments = _file_change_arguments(item)
-                msg = Message.from_dict({
-                    "role": "tool",
-                    "content": content if isinstance(content, str) else json.dumps(content),
-                    "timestamp": get_utc_iso8601_timestamp(),
-                    "unix_timestamp": get_unix_timestamp(),
-                    "id": generate_message_id(),
-                    "tool": "Edit",
-                    "arguments": arguments,
-                    "tool_call_id": tool_call_id,
-                })
+                msg = _codex_message(
+                    "tool", content if isinstance(content, str) else json.dumps(content),
+                    tool="Edit", arguments=arguments, tool_call_id=tool_call_id,
+                )
                 messages.append(self._emit(msg))
 
             else:
                 # Other completed items (reasoning, mcp_tool_call, web_search, plan_update)
                 text = item.get("text", "")
                 if text:
-                    msg = Message.from_dict({
-                        "role": "assistant",
-                        "content": text,
-                        "timestamp": get_utc_iso8601_timestamp(),
-                        "unix_timestamp": get_unix_timestamp(),
-                        "id": generate_message_id(),
-                        "provider": "codex",
-                    })
+                    msg = _codex_message("assistant", text, provider="codex")
                     messages.append(self._emit(msg))
 
         elif event_type == "turn.completed":
@@ -480,21 +460,21 @@ async def tail_codex_output(
                     if evt == "turn.completed":
                         result_data = obj
                         # Still process through converter for token tracking
-                        converter.process_line(line)
+                        converter.process_obj(obj)
                         continue
 
                     # Track errors
                     if evt == "turn.failed":
                         last_error_data = {"is_error": True, "result": obj.get("error", {}).get("message")}
-                        converter.process_line(line)
+                        converter.process_obj(obj)
                         continue
                     if evt == "error":
                         last_error_data = {"is_error": True, "result": obj.get("message")}
-                        converter.process_line(line)
+                        converter.process_obj(obj)
                         continue
 
                     if message_callback:
-                        for msg in converter.process_line(line):
+                        for msg in converter.process_obj(obj):
                             message_callback(msg)
             except (OSError, EOFError, Exception) as e:
                 if check_interrupted_fn and check_interrupted_fn():
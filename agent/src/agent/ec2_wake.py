@@ -4,8 +4,6 @@ import io
 import socket
 import time
 
-import boto3
-import paramiko
 from loguru import logger
 
 from storage.entity.dto import VmConfig
@@ -25,6 +23,8 @@ def _is_stale(last_up: int | None) -> bool:
 
 def _start_and_wait(instance_id: str, region: str) -> None:
     """Start an EC2 instance and wait until it's running."""
+    import boto3
+
     ec2 = boto3.client("ec2", region_name=region)
 
     resp = ec2.describe_instance_status(
@@ -63,6 +63,8 @@ def _parse_ssh_target(vm_name: str) -> tuple:
 
 def _wait_for_ssh(vm_config: VmConfig, max_attempts: int = 36, interval: float = 5) -> None:
     """Try connecting via SSH until successful, up to roughly three minutes."""
+    import paramiko
+
     user, host, port = _parse_ssh_target(vm_config.vm_name)
     key = paramiko.Ed25519Key.from_private_key(io.StringIO(vm_config.api_token))
 
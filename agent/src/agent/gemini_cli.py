@@ -111,7 +111,10 @@ class GeminiStreamConverter:
         obj = parse_stream_line(line)
         if not obj:
             return []
+        return self.process_obj(obj)
 
+    def process_obj(self, obj: Dict) -> List[Message]:
+        """Convert an already-parsed Gemini event (see `process_line`)."""
         event_type = obj.get("type")
         messages: List[Message] = []
 
@@ -372,21 +375,21 @@ async def tail_gemini_output(
                     evt = obj.get("type")
                     if evt == "result":
                         result_data = obj
-                        converter.process_line(line)
+                        converter.process_obj(obj)
                         continue
                     if evt == "error":
                         last_error_data = {
                             "is_error": True,
                             "result": _stringify(obj.get("message") or obj.get("error") or obj),
                         }
-                        converter.process_line(line)
+                        converter.process_obj(obj)
                         continue
 
                     if message_callback:
-                        for msg in converter.process_line(line):
+                        for msg in converter.process_obj(obj):
                             message_callback(msg)
                     else:
-                        converter.process_line(line)
+                        converter.process_obj(obj)
             except (OSError, EOFError, Exception) as e:
                 if check_interrupted_fn and check_interrupted_fn():
                     return "interrupted"
@@ -59,6 +59,7 @@ from agent.claude_code import (
     _parse_ssh_target,
     _shell_quote,
     _ssh_exec,
+    _ssh_exec_bytes,
     _stream_error_suffix,
     _tmux_session_alive,
     _pkill_tail_cmd,
@@ -142,7 +143,10 @@ class GrokStreamConverter:
         obj = parse_stream_line(line)
         if not obj:
             return []
+        return self.process_obj(obj)
 
+    def process_obj(self, obj: Dict) -> List[Message]:
+        """Convert an already-parsed grok event (see `process_line`)."""
         event_type = obj.get("type")
 
         if event_type == "text":
@@ -304,7 +308,7 @@ class _GrokUpdatesPoller:
         # (and duplicated) on the next poll within the same run.
         self.offset = offset
         self._read_offset = offset
-        self._buf = ""
+        self._buf = bytearray()
         self._pending_tool_calls: Dict[str, Dict] = {}
         # Belt-and-braces dedupe: procs registered before this feature shipped
         # have no persisted updates_offset and restart the poll from byte 0 on
@@ -321,7 +325,7 @@ class _GrokUpdatesPoller:
         if not self._available:
             return
         try:
-            chunk = _ssh_exec(self.client, f"tail -c +{self._read_offset + 1} {_shell_quote(self.updates_path)} 2>/dev/null")
+            chunk = _ssh_exec_bytes(self.client, f"tail -c +{self._read_offset + 1} {_shell_quote(self.updates_path)} 2>/dev/null")
         except Exception:
             self._missing_polls += 1
             if self._missing_polls == 1:
@@ -341,20 +345,28 @@ class _GrokUpdatesPoller:
         # Advance the physical read cursor by every byte actually fetched
         # (whether or not it completes a line) so the next `tail -c` read
         # never re-requests bytes already seen, even mid-line.
-        self._read_offset += len(chunk.encode("utf-8"))
-
-        self._buf += chunk
-        lines = self._buf.split("\n")
-        self._buf = lines[-1]  # keep a partial trailing line (file mid-write) for the next pass
-        for line in lines[:-1]:
-            self.offset += len(line.encode("utf-8")) + 1
+        self._read_offset += len(chunk)
+
+        # Scan the byte buffer in place: offsets are plain byte counts (no
+        # re-encoding per line) and a partial trailing line (file mid-write)
+        # stays buffered for the next pass without re-copying the rest.
+        buf = self._buf
+        buf += chunk
+        start = 0
+        while True:
+            end = buf.find(b"\n", start)
+            if end == -1:
+                break
+            self.offset += end - start + 1
+            line = bytes(buf[start:end])
+            start = end + 1
             if line.strip():
                 self._process_line(line)
+        del buf[:start]
 
-    def _process_line(self, line: str) -> None:
-        try:
-            obj = json.loads(line)
-        except (json.JSONDecodeError, TypeError):
+    def _process_line(self, line: bytes) -> None:
+        obj = parse_stream_line(line)
+        if not obj:
             return
         update = ((obj.get("params") or {}).get("update")) or {}
         kind = update.get("sessionUpdate")
@@ -650,7 +662,7 @@ async def tail_grok_output(
                         }
 
                     with state_lock:
-                        messages = converter.process_line(line)
+                        messages = converter.process_obj(obj)
                         if not converter.has_pending:
                             safe_offset = current_offset
                         if message_callback:
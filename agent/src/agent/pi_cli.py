@@ -107,7 +107,10 @@ class PiStreamConverter:
         obj = parse_stream_line(line)
         if not obj:
             return []
+        return self.process_obj(obj)
 
+    def process_obj(self, obj: Dict) -> List[Message]:
+        """Convert an already-parsed pi event (see `process_line`)."""
         event_type = obj.get("type")
         messages: List[Message] = []
 
@@ -370,14 +373,14 @@ async def tail_pi_output(
 
                     if obj.get("type") == "agent_end":
                         result_data = {"is_error": False}
-                        converter.process_line(line)
+                        converter.process_obj(obj)
                         continue
 
                     if message_callback:
-                        for msg in converter.process_line(line):
+                        for msg in converter.process_obj(obj):
                             message_callback(msg)
                     else:
-                        converter.process_line(line)
+                        converter.process_obj(obj)
             except (OSError, EOFError, Exception) as e:
                 if check_interrupted_fn and check_interrupted_fn():
                     return "interrupted"
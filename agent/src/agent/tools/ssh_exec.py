@@ -1,12 +1,20 @@
 import asyncio
+import atexit
+import hashlib
 import io
+import socket
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
 
-import paramiko
 from loguru import logger
 
 from storage.entity.dto import VmConfig
 from agent.ec2_wake import ensure_and_touch_vm
 
+if TYPE_CHECKING:
+    import paramiko
+
 
 def _parse_ssh_target(vm_name: str) -> tuple:
     """Parse 'ssh:user@host:port' or 'ssh:host' into (user, host, port)."""
@@ -27,10 +35,146 @@ def _shell_quote(s: str) -> str:
     return "'" + s.replace("'", "'\"'\"'") + "'"
 
 
-async def ssh_exec(vm_config: VmConfig, cmd: list[str], stdin: str | None = None, dir: str | None = None, timeout: float = 30) -> str:
+_RECV_CHUNK = 1 << 16
+
+
+def _read_stdout(channel) -> bytes:
+    """Drain a channel's stdout in 64 KiB recv calls and join once.
+
+    ChannelFile.read() pulls 8 KiB at a time into a bytearray and then copies
+    it to bytes; large tool outputs pay for both the extra recv round trips
+    and the second full-size copy.
+    """
+    chunks = []
+    recv = channel.recv
+    while True:
+        data = recv(_RECV_CHUNK)
+        if not data:
+            break
+        chunks.append(data)
+    return b"".join(chunks)
+
+
+_KEY_CACHE_SIZE = 8
+# Keyed on a digest of the token so the private key text isn't kept as a key.
+_key_cache: "OrderedDict[bytes, paramiko.Ed25519Key]" = OrderedDict()
+
+
+def _load_key(api_token: str) -> "paramiko.Ed25519Key":
+    """Parse the VM's Ed25519 private key once per distinct token."""
+    import paramiko
+
+    kkey = hashlib.sha256(api_token.encode()).digest()
+    key = _key_cache.get(kkey)
+    if key is None:
+        key = paramiko.Ed25519Key.from_private_key(io.StringIO(api_token))
+        _key_cache[kkey] = key
+        while len(_key_cache) > _KEY_CACHE_SIZE:
+            _key_cache.popitem(last=False)
+    else:
+        _key_cache.move_to_end(kkey)
+    return key
+
+
+_CONN_CACHE_SIZE = 8
+# Seconds between keepalive packets on pooled transports, so a socket left
+# half-open (e.g. across an EC2 stop/start) errors out instead of lingering.
+_KEEPALIVE_INTERVAL = 30
+# paramiko (and the cryptography/bcrypt stack under it) is imported where
+# used, as in the backend modules, so importing this module stays cheap.
+_conn_cache: "OrderedDict[tuple, paramiko.SSHClient]" = OrderedDict()
+_conn_lock = threading.Lock()
+
+
+def _get_client(target: tuple, key, timeout: float) -> tuple["paramiko.SSHClient", bool]:
+    """Return (client, pooled) for target, connecting on a miss.
+
+    Repeated tool calls against the same VM reuse one transport and open a
+    new channel per command, so only the first call pays the TCP + SSH
+    handshake. The cache is a small LRU; evicted clients are closed.
+    ``pooled`` is True when the client came from the cache rather than a
+    connect made by this call.
+    """
+    with _conn_lock:
+        client = _conn_cache.get(target)
+        if client is not None:
+            transport = client.get_transport()
+            if transport and transport.is_active():
+                _conn_cache.move_to_end(target)
+                return client, True
+            del _conn_cache[target]
+            client.close()
+
+    import paramiko
+
+    host, port, user, _ = target
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(host, port=port, username=user, pkey=key, timeout=timeout)
+    client.get_transport().set_keepalive(_KEEPALIVE_INTERVAL)
+
+    with _conn_lock:
+        raced = _conn_cache.get(target)
+        if raced is not None:
+            # Another thread connected first; keep its client.
+            client.close()
+            _conn_cache.move_to_end(target)
+            return raced, True
+        _conn_cache[target] = client
+        evicted = []
+        while len(_conn_cache) > _CONN_CACHE_SIZE:
+            evicted.append(_conn_cache.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return client, False
+
+
+def _connection_failed(exc: Exception, client: "paramiko.SSHClient") -> bool:
+    """Whether exc means the client's transport is unusable, not just one command."""
+    import paramiko
+
+    if isinstance(exc, (paramiko.SSHException, EOFError)):
+        return True
+    transport = client.get_transport()
+    return transport is None or not transport.is_active()
+
+
+def _evict(target: tuple, client: "paramiko.SSHClient") -> None:
+    """Drop and close a client whose connection failed.
+
+    The transport can still report active over a half-open socket, so a
+    connection-level error evicts regardless; other threads' channels on it
+    fail and reconnect.
+    """
+    with _conn_lock:
+        if _conn_cache.get(target) is client:
+            del _conn_cache[target]
+    client.close()
+
+
+@atexit.register
+def _close_all() -> None:
+    with _conn_lock:
+        clients = list(_conn_cache.values())
+        _conn_cache.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+async def ssh_exec_bytes(vm_config: VmConfig, cmd: list[str], stdin=None, dir: str | None = None, timeout: float = 30) -> bytes:
+    """Run cmd on the VM and return its raw stdout (see `ssh_exec`).
+
+    ``stdin`` may be str/bytes or a binary file object, which is copied to
+    the remote stdin in 64 KiB chunks instead of being read into memory.
+    """
     ensure_and_touch_vm(vm_config)
     user, host, port = _parse_ssh_target(vm_config.vm_name)
-    key = paramiko.Ed25519Key.from_private_key(io.StringIO(vm_config.api_token))
+    key = _load_key(vm_config.api_token)
+    # Key fingerprint in the target so a rotated token never reuses an old session.
+    target = (host, port, user, key.get_fingerprint())
 
     parts = ["date +%s > /tmp/ec2-ssh-last-seen;"]
     if dir:
@@ -40,22 +184,56 @@ async def ssh_exec(vm_config: VmConfig, cmd: list[str], stdin: str | None = None
 
     logger.info("ssh_exec host={} port={} user={} cmd={}", host, port, user, shell_cmd)
 
+    def _open(client):
+        try:
+            return client.exec_command(shell_cmd, timeout=timeout)
+        except Exception:
+            _evict(target, client)
+            raise
+
     def _run():
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        client.connect(host, port=port, username=user, pkey=key, timeout=timeout)
+        client, pooled = _get_client(target, key, timeout)
+        try:
+            stdin_ch, stdout_ch, stderr_ch = _open(client)
+        except Exception as e:
+            # A pooled transport may have gone stale while idle; retry once on
+            # a fresh connection. Only opening the channel is retried: once it
+            # is open the command may already have run.
+            if not pooled:
+                raise
+            logger.warning("ssh_exec pooled connection failed ({}), reconnecting", e)
+            client, _ = _get_client(target, key, timeout)
+            stdin_ch, stdout_ch, stderr_ch = _open(client)
 
-        stdin_ch, stdout_ch, stderr_ch = client.exec_command(shell_cmd, timeout=timeout)
-        if stdin:
-            stdin_ch.write(stdin)
-        stdin_ch.close()
+        channel = stdout_ch.channel
+        try:
+            if hasattr(stdin, "read"):
+                while chunk := stdin.read(_RECV_CHUNK):
+                    stdin_ch.write(chunk)
+            elif stdin:
+                stdin_ch.write(stdin)
+            stdin_ch.close()
 
-        result = stdout_ch.read().decode("utf-8", errors="replace")
-        exit_status = stdout_ch.channel.recv_exit_status()
-        client.close()
+            result = _read_stdout(channel)
+            exit_status = channel.recv_exit_status()
+        except socket.timeout:
+            # Only this command is slow; the transport stays pooled for the
+            # other channels running on it.
+            raise
+        except Exception as e:
+            if _connection_failed(e, client):
+                _evict(target, client)
+            raise
+        finally:
+            channel.close()
 
         logger.info("ssh_exec done exit_status={} stdout_len={}", exit_status, len(result))
         return result
 
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(None, _run)
+
+
+async def ssh_exec(vm_config: VmConfig, cmd: list[str], stdin: str | None = None, dir: str | None = None, timeout: float = 30) -> str:
+    data = await ssh_exec_bytes(vm_config, cmd, stdin, dir=dir, timeout=timeout)
+    return data.decode("utf-8", errors="replace")
@@ -22,6 +22,9 @@ class _FakeSftp:
             def __exit__(self, exc_type, exc, tb):
                 return False
 
+            def set_pipelined(self, pipelined=True):
+                pass
+
             def write(self, data):
                 sftp.files[path] = data
 
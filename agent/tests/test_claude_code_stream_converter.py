@@ -7,10 +7,16 @@ tool_use -> assistant tool_calls, tool_result -> tool Message, parent_id linking
 and the malformed-line tolerance.
 """
 
+import io
 import json
 import unittest
+from unittest.mock import Mock
 
-from agent.claude_code import StreamConverter
+from agent.claude_code import (
+    StreamConverter,
+    convert_history_session,
+    tail_ssh_output,
+)
 
 
 class ClaudeCodeStreamConverterTest(unittest.TestCase):
@@ -91,10 +97,34 @@ class ClaudeCodeStreamConverterTest(unittest.TestCase):
                 ],
             },
         }))
-        self.assertEqual(msgs[0].content, json.dumps([{"type": "text", "text": "x"}]))
+        self.assertEqual(json.loads(msgs[0].content), [{"type": "text", "text": "x"}])
         # Unknown tool_use_id -> name/args left unresolved.
         self.assertIsNone(msgs[0].tool)
 
+    def test_multiple_tool_results_get_distinct_ids(self):
+        converter = StreamConverter()
+        msgs = converter.process_line(json.dumps({
+            "type": "user",
+            "uuid": "u5",
+            "message": {
+                "content": [
+                    {"type": "tool_result", "tool_use_id": "t1", "content": "a"},
+                    {"type": "tool_result", "tool_use_id": "t2", "content": "b"},
+                ],
+            },
+        }))
+        self.assertEqual([m.id for m in msgs], ["u5", "u5_1"])
+        self.assertEqual(msgs[1].parent_id, "u5")
+
+    def test_invisible_characters_stripped(self):
+        converter = StreamConverter()
+        msgs = converter.process_line(json.dumps({
+            "type": "assistant",
+            "message": {"content": [{"type": "text", "text": "he\u200bllo"}]},
+        }))
+        self.assertEqual(msgs[0].content, "hello")
+        self.assertEqual(msgs[0].to_dict()["telegram_delivered_images"], [])
+
     def test_empty_assistant_message_dropped(self):
         converter = StreamConverter()
         self.assertEqual(converter.process_line(json.dumps({
@@ -106,6 +136,23 @@ class ClaudeCodeStreamConverterTest(unittest.TestCase):
         converter = StreamConverter()
         self.assertEqual(converter.process_line("not json"), [])
         self.assertEqual(converter.process_line(""), [])
+        self.assertEqual(converter.process_line(" \r\n"), [])
+
+    def test_surrounding_whitespace_tolerated(self):
+        converter = StreamConverter()
+        msgs = converter.process_line(
+            "  " + json.dumps({"type": "assistant", "uuid": "a1",
+                               "message": {"content": [{"type": "text", "text": "hi"}]}}) + "\r\n"
+        )
+        self.assertEqual(msgs[0].content, "hi")
+
+    def test_non_strict_json_still_parsed(self):
+        converter = StreamConverter()
+        msgs = converter.process_line(
+            '{"type": "assistant", "uuid": "a1", "message": {"content": ['
+            '{"type": "tool_use", "id": "t1", "name": "Calc", "input": {"x": NaN}}]}}'
+        )
+        self.assertEqual(msgs[0].tool_calls[0]["function"]["name"], "Calc")
 
     def test_parent_id_links_across_lines(self):
         converter = StreamConverter(last_message_id="seed")
@@ -120,6 +167,162 @@ class ClaudeCodeStreamConverterTest(unittest.TestCase):
         self.assertEqual(first[0].parent_id, "seed")
         self.assertEqual(second[0].parent_id, "a1")
 
+    def test_process_obj_matches_process_line(self):
+        obj = {
+            "type": "assistant", "uuid": "a1",
+            "message": {"content": [{"type": "text", "text": "one"}]},
+        }
+        from_line = StreamConverter(last_message_id="seed").process_line(json.dumps(obj))
+        from_obj = StreamConverter(last_message_id="seed").process_obj(obj)
+        self.assertEqual(len(from_obj), 1)
+        self.assertEqual(from_obj[0].content, from_line[0].content)
+        self.assertEqual(from_obj[0].parent_id, "seed")
+
+    def test_tool_arguments_keep_value_types(self):
+        # True, 1 and 1.0 compare equal, so each call must be serialized on
+        # its own rather than reusing an earlier call's text.
+        converter = StreamConverter()
+        inputs = [
+            {"replace_all": 1},
+            {"replace_all": True},
+            {"replace_all": 1.0},
+        ]
+        for i, tool_input in enumerate(inputs):
+            msgs = converter.process_obj({
+                "type": "assistant", "uuid": f"a{i}",
+                "message": {"content": [
+                    {"type": "tool_use", "id": f"t{i}", "name": "Edit", "input": tool_input},
+                ]},
+            })
+            args = msgs[0].tool_calls[0]["function"]["arguments"]
+            self.assertIs(type(json.loads(args)["replace_all"]), type(tool_input["replace_all"]))
+            self.assertEqual(json.loads(args), tool_input)
+
+
+class ClaudeCodeHistoryConverterTest(unittest.TestCase):
+    def test_binary_file_matches_text_lines(self):
+        lines = [
+            {"type": "user", "uuid": "u1", "sessionId": "s1", "cwd": "/w",
+             "timestamp": "2026-01-01T00:00:00Z", "message": {"content": "héllo"}},
+            {"type": "assistant", "uuid": "a1", "timestamp": "2026-01-01T00:00:01Z",
+             "message": {"content": [{"type": "text", "text": "hi"}]}},
+        ]
+        text = "\n".join(json.dumps(o, ensure_ascii=False) for o in lines) + "\n"
+
+        from_text, sid, work_dir = convert_history_session(text.splitlines(keepends=True))
+        from_bytes, sid_b, work_dir_b = convert_history_session(io.BytesIO(text.encode("utf-8")))
+
+        self.assertEqual((sid_b, work_dir_b), (sid, work_dir))
+        self.assertEqual([m.content for m in from_bytes], ["héllo", "hi"])
+        self.assertEqual([m.content for m in from_bytes], [m.content for m in from_text])
+        self.assertEqual(from_bytes[1].parent_id, "u1")
+
+    def test_bytes_prefilter_matches_parsed_filtering(self):
+        lines = [
+            {"type": "user", "uuid": "u1", "sessionId": "s1", "timestamp": "2026-01-01T00:00:00Z",
+             "message": {"role": "user", "content": "start"}},
+            {"type": "user", "isMeta": True, "uuid": "m1", "timestamp": "2026-01-01T00:00:01Z",
+             "message": {"role": "user", "content": "meta"}},
+            {"type": "assistant", "uuid": "a1", "timestamp": "2026-01-01T00:00:02Z",
+             "message": {"content": [{"type": "text", "text": "one"}]}},
+            {"type": "user", "uuid": "c1", "timestamp": "2026-01-01T00:00:03Z",
+             "message": {"role": "user", "content": "<command-name>/clear</command-name>"}},
+            {"type": "assistant", "uuid": "a2", "timestamp": "2026-01-01T00:00:04Z",
+             "message": {"content": [{"type": "text", "text": "two"}]}},
+        ]
+        text = "\n".join(json.dumps(o, separators=(",", ":")) for o in lines)
+
+        from_text, _, _ = convert_history_session(text.splitlines())
+        from_file, _, _ = convert_history_session(io.BytesIO(text.encode("utf-8")))
+
+        self.assertEqual([m.id for m in from_file], ["u1", "a1", "a2"])
+        self.assertEqual([m.id for m in from_file], [m.id for m in from_text])
+
+    def test_non_dict_content_elements_are_skipped(self):
+        lines = [
+            {"type": "assistant", "uuid": "a1", "timestamp": "2026-01-01T00:00:00Z",
+             "message": {"content": [{"type": "tool_use", "id": "t1", "name": "Read", "input": {}}]}},
+            {"type": "user", "uuid": "r1", "timestamp": "2026-01-01T00:00:01Z",
+             "message": {"role": "user", "content": [
+                 "stray", {"type": "tool_result", "tool_use_id": "t1", "content": "ok"},
+             ]}},
+        ]
+        messages, _, _ = convert_history_session(json.dumps(o) for o in lines)
+        self.assertEqual([(m.role, m.content) for m in messages], [("assistant", ""), ("tool", "ok")])
+
+
+class _LineStdout:
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self.channel = Mock()
+        self.channel.makefile.return_value = self
+
+    def __iter__(self):
+        return self._lines
+
+
+class ClaudeCodeTailBatchCallbackTest(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_callback_receives_messages_grouped_per_line(self):
+        lines = [
+            json.dumps({
+                "type": "assistant", "uuid": "a1",
+                "message": {"content": [
+                    {"type": "tool_use", "id": "t1", "name": "Read", "input": {"file_path": "/a"}},
+                    {"type": "tool_use", "id": "t2", "name": "Read", "input": {"file_path": "/b"}},
+                ]},
+            }).encode() + b"\n",
+            json.dumps({
+                "type": "user", "uuid": "u1",
+                "message": {"content": [
+                    {"type": "tool_result", "tool_use_id": "t1", "content": "a"},
+                    {"type": "tool_result", "tool_use_id": "t2", "content": "b"},
+                ]},
+            }).encode() + b"\n",
+            json.dumps({"type": "result", "session_id": "s1"}).encode() + b"\n",
+        ]
+        client = Mock()
+        client.exec_command.return_value = (Mock(), _LineStdout(lines), Mock())
+        batches = []
+        single = Mock()
+
+        result = await tail_ssh_output(
+            chat_id="chat-1",
+            vm_config=Mock(),
+            message_callback=single,
+            message_batch_callback=batches.append,
+            ssh_client=client,
+        )
+
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual([[m.role for m in b] for b in batches], [["assistant"], ["tool", "tool"]])
+        single.assert_not_called()
+        client.exec_command.return_value[1].channel.makefile.assert_called_once_with("rb", 1 << 16)
+
+    async def test_system_and_unknown_lines_skip_full_parse(self):
+        lines = [
+            json.dumps({"type": "system", "subtype": "init", "session_id": "s-init",
+                        "tools": ["Read"]}, separators=(",", ":")).encode() + b"\n",
+            b'{"type":"rate_limit_event","info":{not json}}\n',
+            json.dumps({"type": "assistant", "uuid": "a1",
+                        "message": {"content": [{"type": "text", "text": "hi"}]}},
+                       separators=(",", ":")).encode() + b"\n",
+            json.dumps({"type": "result"}).encode() + b"\n",
+        ]
+        client = Mock()
+        client.exec_command.return_value = (Mock(), _LineStdout(lines), Mock())
+        received = []
+
+        result = await tail_ssh_output(
+            chat_id="chat-1",
+            vm_config=Mock(),
+            message_callback=received.append,
+            ssh_client=client,
+        )
+
+        self.assertEqual(result["session_id"], "s-init")
+        self.assertEqual(result["offset"], 4)
+        self.assertEqual([m.id for m in received], ["a1"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -103,6 +103,17 @@ class CodexStreamConverterTest(unittest.TestCase):
             "update /Users/roy/luohy15/code/y-agent-chat-backend-defaults-2079/web/src/App.tsx",
         )
 
+    def test_process_obj_converts_parsed_events(self):
+        converter = CodexStreamConverter()
+        converter.process_obj({"type": "thread.started", "thread_id": "th-1"})
+        msgs = converter.process_obj({
+            "type": "item.completed",
+            "item": {"id": "item_1", "type": "agent_message", "text": "done"},
+        })
+
+        self.assertEqual(converter.thread_id, "th-1")
+        self.assertEqual([m.content for m in msgs], ["done"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -472,7 +472,7 @@ class GrokUpdatesPollerTest(unittest.TestCase):
 
         poller.poll_once()
         self.assertEqual(received, [])
-        self.assertEqual(poller._buf, full_line[:20])
+        self.assertEqual(poller._buf, full_line[:20].encode())
         self.assertEqual(poller.offset, 0)  # no complete line yet: logical offset unchanged
         self.assertEqual(client.requested_offsets, [1])
 
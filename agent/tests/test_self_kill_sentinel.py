@@ -25,6 +25,9 @@ class EmptyChannel:
     def __init__(self):
         self.channel = self
 
+    def makefile(self, mode, bufsize=-1):
+        return self
+
     def __iter__(self):
         return iter([])
 
@@ -40,6 +43,9 @@ class BlockingChannel:
         self._closed = False
         self.channel = self
 
+    def makefile(self, mode, bufsize=-1):
+        return self
+
     def __iter__(self):
         return self
 
@@ -61,6 +67,9 @@ class OneLineThenBlock:
         self._closed = False
         self.channel = self
 
+    def makefile(self, mode, bufsize=-1):
+        return self
+
     def __iter__(self):
         return self
 
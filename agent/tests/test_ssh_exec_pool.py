@@ -0,0 +1,109 @@
+import asyncio
+import socket
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from agent.tools import ssh_exec
+
+
+class _FakeChannel:
+    def __init__(self, data: bytes, error=None):
+        self._data = [data]
+        self._error = error
+        self.closed = False
+
+    def recv(self, n):
+        if self._error:
+            raise self._error
+        return self._data.pop() if self._data else b""
+
+    def recv_exit_status(self):
+        return 0
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeStdin:
+    def write(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FakeClient:
+    def __init__(self, error=None, data=b"ok", read_error=None):
+        self.error = error
+        self.data = data
+        self.read_error = read_error
+        self.channels = []
+        self.closed = False
+
+    def exec_command(self, cmd, timeout=None):
+        if self.error:
+            raise self.error
+        channel = _FakeChannel(self.data, self.read_error)
+        self.channels.append(channel)
+        return _FakeStdin(), SimpleNamespace(channel=channel), None
+
+    def get_transport(self):
+        return SimpleNamespace(is_active=lambda: True)
+
+    def close(self):
+        self.closed = True
+
+
+class PooledRetryTest(unittest.TestCase):
+    def setUp(self):
+        ssh_exec._conn_cache.clear()
+        self.addCleanup(ssh_exec._conn_cache.clear)
+        self.vm = SimpleNamespace(vm_name="ssh:me@host:22", api_token="token")
+        fake_key = SimpleNamespace(get_fingerprint=lambda: b"fp")
+        for target, kwargs in (
+            ("ensure_and_touch_vm", {}),
+            ("_load_key", {"return_value": fake_key}),
+        ):
+            patcher = patch.object(ssh_exec, target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, clients):
+        with patch.object(ssh_exec, "_get_client", side_effect=clients) as get_client:
+            result = asyncio.run(ssh_exec.ssh_exec_bytes(self.vm, ["true"]))
+        return result, get_client.call_count
+
+    def test_stale_pooled_client_is_evicted_and_retried(self):
+        stale = _FakeClient(error=EOFError())
+        result, calls = self._run([(stale, True), (_FakeClient(), False)])
+        self.assertEqual(result, b"ok")
+        self.assertEqual(calls, 2)
+        self.assertTrue(stale.closed)
+
+    def test_channels_are_closed_after_the_exit_status(self):
+        client = _FakeClient()
+        self._run([(client, True)])
+        self.assertTrue(client.channels[0].closed)
+        self.assertFalse(client.closed)
+
+    def test_failure_after_the_channel_opened_is_not_retried(self):
+        dropped = _FakeClient(read_error=EOFError())
+        with self.assertRaises(EOFError):
+            self._run([(dropped, True), (_FakeClient(), False)])
+        self.assertTrue(dropped.closed)
+
+    def test_fresh_connection_failure_is_not_retried(self):
+        with self.assertRaises(EOFError):
+            self._run([(_FakeClient(error=EOFError()), False)])
+
+    def test_read_timeout_closes_only_the_channel(self):
+        slow = _FakeClient(read_error=socket.timeout())
+        with self.assertRaises(socket.timeout):
+            self._run([(slow, True)])
+        self.assertFalse(slow.closed)
+        self.assertTrue(slow.channels[0].closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,9 @@ class BlockingStdout:
         self._closed = False
         self.channel = self
 
+    def makefile(self, mode, bufsize=-1):
+        return self
+
     def __iter__(self):
         return self
 
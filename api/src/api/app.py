@@ -1,4 +1,3 @@
-import json
 import os
 import uvicorn
 from dotenv import load_dotenv
@@ -6,15 +5,10 @@ from storage.global_config import load_global_config
 
 load_dotenv()
 load_global_config()
-from typing import Any
 from fastapi import APIRouter, FastAPI
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-
-class UnicodeJSONResponse(JSONResponse):
-    def render(self, content: Any) -> bytes:
-        return json.dumps(content, ensure_ascii=False).encode("utf-8")
+from api.util.response import UnicodeJSONResponse
 
 from api.controller.auth import router as auth_router
 from api.controller.chat import router as chat_router
@@ -96,8 +90,13 @@ api_router.include_router(health_router)
 app.include_router(api_router)
 
 def main():
+    # Auto-reload (a file watcher plus a restart per change) is for
+    # development only; set Y_AGENT_DEV=1 to get it. Otherwise uvicorn's
+    # defaults apply: loop/http "auto" pick uvloop and httptools when they are
+    # installed, and WEB_CONCURRENCY sets the worker count.
     port = int(os.environ.get("API_PORT", 8001))
-    uvicorn.run("api.app:app", host="0.0.0.0", port=port, reload=True)
+    dev = os.environ.get("Y_AGENT_DEV") == "1"
+    uvicorn.run("api.app:app", host="0.0.0.0", port=port, reload=dev)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 
+from api.util.response import UnicodeJSONResponse
 from storage.service import calendar_event as event_service
 
 router = APIRouter(prefix="/calendar")
@@ -61,7 +62,8 @@ async def list_events(
         created_on=created_on, created_from=created_from, created_to=created_to,
         updated_on=updated_on, updated_from=updated_from, updated_to=updated_to,
     )
-    return [e.to_dict() for e in events]
+    # Plain dicts already: skip FastAPI's jsonable_encoder pass over them.
+    return UnicodeJSONResponse([e.to_dict() for e in events])
 
 
 @router.get("/detail")
@@ -90,7 +92,12 @@ async def create_event(req: CreateEventRequest, request: Request):
 @router.post("/update")
 async def update_event(req: UpdateEventRequest, request: Request):
     user_id = _get_user_id(request)
-    fields = {k: v for k, v in req.model_dump(exclude={"event_id"}).items() if v is not None}
+    # Flat model of scalars: read the fields directly instead of model_dump().
+    fields = {}
+    for name in UpdateEventRequest.model_fields:
+        value = getattr(req, name)
+        if name != "event_id" and value is not None:
+            fields[name] = value
     if not fields:
         raise HTTPException(status_code=400, detail="No fields to update")
     try:
@@ -2,9 +2,16 @@ import asyncio
 import base64
 import dataclasses
 import fnmatch
+import hashlib
 import json
 import mimetypes
 import os
+import re
+import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from loguru import logger
@@ -13,6 +20,11 @@ from fastapi import APIRouter, File, Form, HTTPException, Query, Request, Upload
 from fastapi.responses import Response
 from pydantic import BaseModel
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - optional speedup, stdlib json fallback
+    _loads = json.loads
+
 router = APIRouter(prefix="/file")
 
 Y_AGENT_HOME = Path(os.environ.get("Y_AGENT_HOME") or "/Users/roy/luohy15").expanduser().resolve()
@@ -43,34 +55,199 @@ def _get_cmd_runner_cls():
     return _cmd_runner_cls
 
 
+# The per-process TTL caches below are keyed on request params, so they are
+# also capped in size.
+_TTL_CACHE_MAX = 256
+
+
+def _ttl_cache_put(cache: dict, key: tuple, value, ttl: float, now: float) -> None:
+    """Store (now, value) under key, keeping cache within _TTL_CACHE_MAX.
+
+    Entries are re-inserted at the end, so the dict stays oldest-first and a
+    full cache sheds expired entries, then the oldest live ones, from the front.
+    """
+    cache.pop(key, None)
+    if len(cache) >= _TTL_CACHE_MAX:
+        for old in list(cache):
+            if now - cache[old][0] < ttl and len(cache) < _TTL_CACHE_MAX:
+                break
+            del cache[old]
+    cache[key] = (now, value)
+
+
+# Resolved VmConfigs, keyed by (user_id, vm_name). Resolution is up to four
+# DB lookups, and a single page view fans out into several /file calls (some
+# with two _exec's each); a short TTL lets them share one resolution.
+_VM_CONFIG_TTL = 10.0
+_vm_config_cache: dict[tuple, tuple[float, object]] = {}
+
+
+def _get_vm_config(user_id: int, vm_name: str = None, work_dir: str = None):
+    cache_key = (user_id, vm_name)
+    now = time.monotonic()
+    hit = _vm_config_cache.get(cache_key)
+    if hit and now - hit[0] < _VM_CONFIG_TTL:
+        vm_config = hit[1]
+    else:
+        from agent.config import resolve_vm_config
+        vm_config = resolve_vm_config(user_id, vm_name)
+        _ttl_cache_put(_vm_config_cache, cache_key, vm_config, _VM_CONFIG_TTL, now)
+    # Always hand out a copy: callers may override work_dir, and the SSH
+    # layer updates last_up in place.
+    return dataclasses.replace(vm_config, work_dir=work_dir) if work_dir else dataclasses.replace(vm_config)
+
+
+# Local-VM file work (reads, scandir walks, upload copies) gets its own
+# threads rather than the loop's default executor, which remote SSH calls
+# hold for up to their full timeout and which is only min(32, cpus + 4) wide.
+_IO_WORKERS = 16
+_io_pool: ThreadPoolExecutor | None = None
+
+
+async def _io_call(fn, *args):
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=_IO_WORKERS, thread_name_prefix="file-io")
+    return await asyncio.get_running_loop().run_in_executor(_io_pool, fn, *args)
+
+
+# Larger files, and anything that isn't a regular file (devices, FIFOs,
+# directories), go through the `cat` subprocess and its timeout instead.
+_LOCAL_CAT_MAX = 32 * 1024 * 1024
+
+
+def _local_cat(path: str, cwd: str | None) -> bytes | None:
+    """In-process `cat PATH` for local VMs, output merged like the subprocess.
+
+    Returns None when the path should be left to the subprocess.
+    """
+    full_path = os.path.join(os.path.expanduser(cwd), path) if cwd else path
+    try:
+        # O_NONBLOCK so a FIFO swapped in after the check can't block the open.
+        fd = os.open(full_path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError as exc:
+        return f"cat: {path}: {exc.strerror}\n".encode()
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode) or st.st_size > _LOCAL_CAT_MAX:
+            return None
+        with open(fd, "rb", closefd=False) as f:
+            data = f.read(_LOCAL_CAT_MAX + 1)
+    finally:
+        os.close(fd)
+    return data if len(data) <= _LOCAL_CAT_MAX else None
+
+
+def _is_plain_cat(cmd: list[str]) -> bool:
+    return len(cmd) == 2 and cmd[0] == "cat" and not cmd[1].startswith("-")
+
+
 async def _exec(user_id: int, cmd: list[str], timeout: float = 10, vm_name: str = None, work_dir: str = None) -> str:
-    from agent.config import resolve_vm_config
-    vm_config = resolve_vm_config(user_id, vm_name)
-    if work_dir:
-        vm_config = dataclasses.replace(vm_config, work_dir=work_dir)
+    vm_config = _get_vm_config(user_id, vm_name, work_dir)
+    # `cat` is most of the /file traffic (read, raw, settings.json before
+    # every list/search); on a local VM read the file here instead of
+    # spawning a process for it.
+    if not vm_config.api_token and _is_plain_cat(cmd):
+        data = await _io_call(_local_cat, cmd[1], vm_config.work_dir)
+        if data is not None:
+            return data.decode()
     runner = _get_cmd_runner_cls()(vm_config)
     return await runner.run_cmd(cmd, timeout=timeout)
 
 
+# Parsed exclude lists, keyed by (user_id, vm_name, work_dir, key). The file
+# browser lists/searches in bursts; a short TTL saves a `cat` round trip per
+# request while still picking up settings.json edits quickly.
+_EXCLUDES_TTL = 5.0
+_excludes_cache: dict[tuple, tuple[float, list[str]]] = {}
+
+
 async def _get_vscode_excludes(user_id: int, vm_name: str, key: str, work_dir: str = None) -> list[str]:
+    cache_key = (user_id, vm_name, work_dir, key)
+    now = time.monotonic()
+    hit = _excludes_cache.get(cache_key)
+    if hit and now - hit[0] < _EXCLUDES_TTL:
+        return hit[1]
     try:
         raw = await _exec(user_id, ["cat", ".vscode/settings.json"], vm_name=vm_name, work_dir=work_dir)
-        settings = json.loads(raw)
+        settings = _loads(raw)
         excludes = settings.get(key, {})
-        return [pat.removeprefix("**/") for pat, enabled in excludes.items() if enabled is True]
+        patterns = [pat.removeprefix("**/") for pat, enabled in excludes.items() if enabled is True]
     except Exception:
+        patterns = []
+    _ttl_cache_put(_excludes_cache, cache_key, patterns, _EXCLUDES_TTL, now)
+    return patterns
+
+
+@lru_cache(maxsize=64)
+def _compile_excludes(patterns: tuple[str, ...]):
+    """One compiled regex matching any of the fnmatch patterns, or None."""
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pat) for pat in patterns)).match
+
+
+def _exclude_matcher(excludes: list[str]):
+    return _compile_excludes(tuple(excludes))
+
+
+_CTRL_CHAR_RE = re.compile(r"[\x00-\x1f\x7f]")
+_CTRL_NON_NL_RE = re.compile(r"[\x00-\x09\x0b-\x1f\x7f]")
+
+
+def _local_list(path: str, cwd: str | None) -> list[dict]:
+    """`ls -1apL PATH` for local VMs, read with scandir instead of a process.
+
+    Names with control characters are dropped as on the ls path, so local and
+    remote listings agree. A missing or non-directory path lists as empty.
+    """
+    full_path = os.path.join(os.path.expanduser(cwd), path) if cwd else path
+    entries = []
+    try:
+        with os.scandir(full_path) as it:
+            for e in it:
+                if _CTRL_CHAR_RE.search(e.name):
+                    continue
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append({"name": e.name, "type": "directory" if is_dir else "file"})
+    except OSError:
         return []
+    entries.sort(key=lambda e: e["name"])
+    return entries
 
 
 @router.get("/list")
 async def list_files(request: Request, path: str = Query("."), vm_name: str = Query(None), work_dir: str = Query(None), sort: str = Query(None)):
     user_id = _get_user_id(request)
-    excludes = await _get_vscode_excludes(user_id, vm_name, "files.exclude", work_dir=work_dir)
-    logger.info("list_files excludes: {}", excludes)
+    if sort != "atime":
+        vm_config = _get_vm_config(user_id, vm_name, work_dir)
+        if not vm_config.api_token:
+            excludes, entries = await asyncio.gather(
+                _get_vscode_excludes(user_id, vm_name, "files.exclude", work_dir=work_dir),
+                _io_call(_local_list, path, vm_config.work_dir),
+            )
+            is_excluded = _exclude_matcher(excludes)
+            if is_excluded:
+                entries = [e for e in entries if not is_excluded(e["name"])]
+            return {"path": path, "entries": entries}
     if sort == "atime":
         # Use find -printf to get atime as epoch + filename, sorted descending
-        stat_cmd = ["bash", "-c", f"find {path} -maxdepth 1 -type f -printf '%A@\\t%f\\n' | sort -rn"]
-        output = await _exec(user_id, stat_cmd, vm_name=vm_name, work_dir=work_dir)
+        cmd = ["bash", "-c", f"find {path} -maxdepth 1 -type f -printf '%A@\\t%f\\n' | sort -rn"]
+    else:
+        # ls -1apL: one per line, show dirs with /, show hidden, dereference symlinks
+        cmd = ["ls", "-1apL", path]
+    # Independent round trips to the VM: the settings read (which never
+    # raises) and the listing itself.
+    excludes, output = await asyncio.gather(
+        _get_vscode_excludes(user_id, vm_name, "files.exclude", work_dir=work_dir),
+        _exec(user_id, cmd, vm_name=vm_name, work_dir=work_dir),
+    )
+    logger.info("list_files excludes: {}", excludes)
+    is_excluded = _exclude_matcher(excludes)
+    if sort == "atime":
         entries = []
         for line in output.strip().splitlines():
             if not line:
@@ -79,7 +256,7 @@ async def list_files(request: Request, path: str = Query("."), vm_name: str = Qu
             if len(parts) != 2:
                 continue
             atime_str, name = parts
-            if any(fnmatch.fnmatch(name, pat) for pat in excludes):
+            if is_excluded and is_excluded(name):
                 continue
             try:
                 atime = int(float(atime_str))
@@ -88,32 +265,51 @@ async def list_files(request: Request, path: str = Query("."), vm_name: str = Qu
             entries.append({"name": name, "type": "file", "atime": atime})
         return {"path": path, "entries": entries}
 
-    # ls -1apL: one per line, show dirs with /, show hidden, dereference symlinks
-    ls_cmd = ["ls", "-1apL", path]
-    output = await _exec(user_id, ls_cmd, vm_name=vm_name, work_dir=work_dir)
-    entries = []
-    for line in output.strip().splitlines():
-        if not line or line == "./" or line == "../":
-            continue
-        # Skip entries with control characters (non-printable)
-        if any(c < ' ' or c == '\x7f' for c in line.rstrip("/")):
-            continue
-        name = line[:-1] if line.endswith("/") else line
-        if any(fnmatch.fnmatch(name, pat) for pat in excludes):
-            continue
-        if line.endswith("/"):
-            entries.append({"name": name, "type": "directory"})
-        else:
-            entries.append({"name": name, "type": "file"})
+    # Split on "\n" only: splitlines() would also break a name apart at
+    # \x1c-\x1e or \r, letting the fragments through the control-char filter.
+    lines = output.strip().split("\n")
+    # One scan over the whole buffer; only when it finds a control character
+    # (rare) do individual lines need checking.
+    if _CTRL_NON_NL_RE.search(output):
+        ctrl_search = _CTRL_CHAR_RE.search
+        lines = [line for line in lines if not ctrl_search(line)]
+    entries = [
+        {"name": line[:-1], "type": "directory"} if line[-1] == "/" else {"name": line, "type": "file"}
+        for line in lines
+        if line and line != "./" and line != "../"
+    ]
+    if is_excluded:
+        entries = [e for e in entries if not is_excluded(e["name"])]
     return {"path": path, "entries": entries}
 
 
+# Content-hash ETags for /file/read and /file/raw. The body has to come off the
+# VM to hash it either way (a stat would be a second round trip), so this
+# saves the transfer to the client rather than the read itself.
+def _etag(data: bytes) -> str:
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 @router.get("/read")
-async def read_file(request: Request, path: str = Query(...), vm_name: str = Query(None), work_dir: str = Query(None)):
+async def read_file(request: Request, response: Response, path: str = Query(...), vm_name: str = Query(None), work_dir: str = Query(None)):
     user_id = _get_user_id(request)
     if path.startswith("/") or path.startswith("~"):
         work_dir = None
     content = await _exec(user_id, ["cat", path], vm_name=vm_name, work_dir=work_dir)
+    etag = _etag(content.encode("utf-8", "surrogatepass"))
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return {"path": path, "content": content}
 
 
@@ -124,22 +320,20 @@ _SKILLS_DIR = "/Users/roy/luohy15/.agents/skills"
 async def list_prd(request: Request, vm_name: str = Query(None)):
     user_id = _get_user_id(request)
     code_dir = f"{Y_AGENT_HOME}/code"
-    script = (
-        f"find {code_dir} -maxdepth 4 -type f -path '*/docs/prd/*.md' -print | "
-        "while IFS= read -r path; do "
-        f'rel=${{path#"{code_dir}/"}}; '
-        'project=${rel%%/*}; '
-        'name=${path##*/}; '
-        'printf "%s\\t%s\\t%s\\n" "$project" "$name" "$path"; '
-        "done"
+    # Plain `find -print` and split in Python: the old `while read` loop ran
+    # the shell interpreter once per match just to slice the path.
+    output = await _exec(
+        user_id,
+        ["find", code_dir, "-maxdepth", "4", "-type", "f", "-path", "*/docs/prd/*.md", "-print"],
+        vm_name=vm_name, timeout=15,
     )
-    output = await _exec(user_id, ["bash", "-c", script], vm_name=vm_name, timeout=15)
+    prefix = f"{code_dir}/"
     entries = []
-    for line in output.splitlines():
-        parts = line.split("\t", 2)
-        if len(parts) != 3:
+    for path in output.splitlines():
+        if not path.startswith(prefix):
             continue
-        project, name, path = parts
+        project = path[len(prefix):].split("/", 1)[0]
+        name = path.rsplit("/", 1)[-1]
         entries.append({"project": project, "name": name, "path": path})
     entries.sort(key=lambda entry: (entry["project"], entry["name"] != "README.md", entry["name"]))
     return {"entries": entries}
@@ -149,15 +343,19 @@ async def list_prd(request: Request, vm_name: str = Query(None)):
 async def list_skills(request: Request, vm_name: str = Query(None)):
     user_id = _get_user_id(request)
     # For each subdir with a SKILL.md, emit "name\tdescription" (description from YAML
-    # frontmatter; only the first line, no continuation parsing).
+    # frontmatter; only the first line, no continuation parsing). One awk process
+    # walks every SKILL.md matched by the glob (no per-skill test/basename/awk
+    # forks) and skips the rest of a file once its description is found. Empty
+    # files never reach FNR == 1, so END emits any argument not seen.
     script = (
-        f'for d in {_SKILLS_DIR}/*/; do '
-        'name=$(basename "$d"); '
-        'f="$d/SKILL.md"; '
-        '[ -f "$f" ] || continue; '
-        'desc=$(awk \'/^description:/{sub(/^description: */, ""); print; exit}\' "$f"); '
-        'printf "%s\\t%s\\n" "$name" "$desc"; '
-        'done'
+        f"shopt -s nullglob; set -- {_SKILLS_DIR}/*/SKILL.md; "
+        '[ $# -gt 0 ] || exit 0; '
+        "awk '"
+        'function emit(f, desc) { sub(/\\/SKILL\\.md$/, "", f); sub(/.*\\//, "", f); printf "%s\\t%s\\n", f, desc } '
+        'FNR == 1 { if (f != "") emit(f, d); f = FILENAME; seen[f] = 1; d = "" } '
+        '/^description:/ { d = $0; sub(/^description: */, "", d); nextfile } '
+        'END { if (f != "") emit(f, d); for (i = 1; i < ARGC; i++) if (!(ARGV[i] in seen)) emit(ARGV[i], "") }'
+        "' \"$@\" 2>/dev/null || true"
     )
     output = await _exec(user_id, ["bash", "-c", script], vm_name=vm_name, timeout=15)
     skills = []
@@ -177,11 +375,12 @@ async def list_skills(request: Request, vm_name: str = Query(None)):
 
 
 async def _exec_bytes(user_id: int, cmd: list[str], timeout: float = 10, vm_name: str = None, work_dir: str = None) -> bytes:
-    from agent.config import resolve_vm_config
-    vm_config = resolve_vm_config(user_id, vm_name)
-    if work_dir:
-        vm_config = dataclasses.replace(vm_config, work_dir=work_dir)
+    vm_config = _get_vm_config(user_id, vm_name, work_dir)
     if not vm_config.api_token:
+        if _is_plain_cat(cmd):
+            data = await _io_call(_local_cat, cmd[1], vm_config.work_dir)
+            if data is not None:
+                return data
         proc = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
@@ -190,31 +389,111 @@ async def _exec_bytes(user_id: int, cmd: list[str], timeout: float = 10, vm_name
         )
         stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
         return stdout or b""
-    # For remote VMs, read via base64 encoding
-    import base64
-    b64 = await _exec(user_id, ["base64", cmd[-1]], timeout=timeout, vm_name=vm_name, work_dir=work_dir)
-    return base64.b64decode(b64)
+    # Remote VMs: the SSH channel is binary-safe, so take stdout as-is
+    # rather than base64-encoding on the VM (4/3 the bytes on the wire).
+    from agent.tools.ssh_exec import ssh_exec_bytes
+    return await ssh_exec_bytes(vm_config, cmd, dir=vm_config.work_dir or None, timeout=timeout)
+
+
+_SEARCH_OUTPUT_CAP = 64 * 1024
+# Headroom over the 50 returned, for hits the exclude guard below drops.
+_SEARCH_RECORD_CAP = 100
+
+
+def _local_search(q: str, path: str, cwd: str | None, excludes: list[str]) -> list[str]:
+    """The find walk of search_files for local VMs, stopping at 50 hits.
+
+    Same shape as `find PATH -maxdepth 8 -type f -iname '*q*'` with the
+    excludes applied: symlinks are not followed, excluded directories are
+    pruned, and hits are reported relative to the work dir like find prints
+    them.
+    """
+    root = os.path.join(os.path.expanduser(cwd), path) if cwd else path
+    name_match = re.compile(fnmatch.translate(f"*{q}*"), re.IGNORECASE).match
+    is_excluded = _exclude_matcher(excludes)
+    files = []
+    stack = [(root, path, 1)]
+    while stack:
+        dir_path, rel_dir, depth = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                dir_entries = list(it)
+        except OSError:
+            continue
+        for e in dir_entries:
+            rel = os.path.join(rel_dir, e.name).removeprefix("./")
+            if is_excluded and (is_excluded(e.name) or is_excluded(rel)):
+                continue
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    if depth < 8:
+                        stack.append((e.path, rel, depth + 1))
+                    continue
+                if not e.is_file(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            if name_match(e.name):
+                files.append(rel)
+                if len(files) == 50:
+                    return files
+    return files
 
 
 @router.get("/search")
 async def search_files(request: Request, q: str = Query(...), path: str = Query("."), vm_name: str = Query(None), work_dir: str = Query(None)):
     user_id = _get_user_id(request)
     excludes = await _get_vscode_excludes(user_id, vm_name, "search.exclude", work_dir=work_dir)
-    # Build find command with exclude args from vscode settings
+    vm_config = _get_vm_config(user_id, vm_name, work_dir)
+    if not vm_config.api_token:
+        files = await _io_call(_local_search, q, path, vm_config.work_dir, excludes)
+        return {"query": q, "files": files}
+    import shlex
+    # Prefer ripgrep's parallel walker when the VM has it; fall back to find.
+    # Both honor the vscode excludes, include hidden files, ignore .gitignore
+    # (same results as before), and emit NUL-separated paths.
+    rg_cmd = ["rg", "--files", "--hidden", "--no-ignore", "--max-depth", "8", "--null"]
+    for pat in excludes:
+        rg_cmd += ["--glob", f"!{pat}"]
+    rg_cmd += ["--iglob", f"*{q}*", path]
     find_cmd = ["find", path, "-maxdepth", "8", "-type", "f"]
     for pat in excludes:
-        find_cmd += ["-not", "-path", f"*/{pat}/*" if not pat.startswith("*") else pat]
-    find_cmd += ["-iname", f"*{q}*"]
-    logger.info("search_files cmd: {}", find_cmd)
-    output = await _exec(user_id, find_cmd, timeout=10, vm_name=vm_name, work_dir=work_dir)
+        if pat.startswith("*"):
+            find_cmd += ["-not", "-path", pat]
+        else:
+            # Excludes can name files as well as directories (e.g.
+            # package-lock.json); drop both on the VM so they don't eat into
+            # the output cap.
+            find_cmd += ["-not", "-path", f"*/{pat}/*", "-not", "-name", pat]
+    find_cmd += ["-iname", f"*{q}*", "-print0"]
+    # Only 50 results are returned: cap what the VM sends instead of
+    # shipping the whole walk. Where head understands NUL-terminated records
+    # (GNU), stop after _SEARCH_RECORD_CAP hits so the walk itself ends early;
+    # `head -c` is the portable byte cap behind it. The walker stops on
+    # SIGPIPE once either cap is reached.
+    script = (
+        f"if printf 'x\\0' | head -z -n 1 >/dev/null 2>&1; then lim='head -z -n {_SEARCH_RECORD_CAP}'; else lim=cat; fi; "
+        f"{{ if command -v rg >/dev/null 2>&1; then {shlex.join(rg_cmd)}; "
+        f"else {shlex.join(find_cmd)}; fi; }} | $lim | head -c {_SEARCH_OUTPUT_CAP}"
+    )
+    logger.info("search_files cmd: {}", script)
+    output = await _exec(user_id, ["bash", "-c", script], timeout=10, vm_name=vm_name, work_dir=work_dir)
+    # The walkers already applied the excludes; this is one pass of the shared
+    # compiled matcher over at most 50 hits, for patterns they can't express
+    # exactly (fnmatch's `*` also crosses `/`).
+    is_excluded = _exclude_matcher(excludes)
     files = []
-    for line in output.strip().splitlines():
-        if not line or len(files) >= 50:
+    # Every path is NUL-terminated, so the last piece is either empty or an
+    # entry cut off by the cap; drop it.
+    for line in output.split("\0")[:-1]:
+        if not line:
             continue
         rel = line.removeprefix("./")
-        if any(fnmatch.fnmatch(rel, pat) or fnmatch.fnmatch(os.path.basename(rel), pat) for pat in excludes):
+        if is_excluded and (is_excluded(rel) or is_excluded(os.path.basename(rel))):
             continue
         files.append(rel)
+        if len(files) == 50:
+            break
     return {"query": q, "files": files}
 
 
@@ -339,6 +618,25 @@ async def move_files(request: Request, body: MoveRequest, vm_name: str = Query(N
 
 
 _MAX_UPLOAD_BYTES = 50 * 1024 * 1024  # 50 MB
+_UPLOAD_CHUNK = 1 << 20
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Size of the spooled upload, without reading it into memory."""
+    if file.size is not None:
+        return file.size
+    f = file.file
+    pos = f.tell()
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(pos)
+    return size
+
+
+def _copy_upload(src, full_path: str) -> None:
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "wb") as f:
+        shutil.copyfileobj(src, f, _UPLOAD_CHUNK)
 
 
 @router.post("/upload")
@@ -350,32 +648,35 @@ async def upload_file(
     work_dir: str = Form(None),
 ):
     user_id = _get_user_id(request)
-    content = await file.read(_MAX_UPLOAD_BYTES + 1)
-    if len(content) > _MAX_UPLOAD_BYTES:
+    # The multipart parser has already spooled the body to a temp file;
+    # copy from it in chunks rather than holding the whole upload in memory.
+    size = _upload_size(file)
+    if size > _MAX_UPLOAD_BYTES:
         raise HTTPException(status_code=413, detail="File too large (max 50 MB)")
 
     filename = os.path.basename(file.filename or "upload")
     dest_path = f"{dest_dir}/{filename}"
 
-    from agent.config import resolve_vm_config
-    vm_config = resolve_vm_config(user_id, vm_name)
-    if work_dir:
-        vm_config = dataclasses.replace(vm_config, work_dir=work_dir)
+    vm_config = _get_vm_config(user_id, vm_name, work_dir)
+    await file.seek(0)
     if not vm_config.api_token:
-        # Local: write directly to disk
+        # Local: copy straight to disk
         effective_dir = os.path.expanduser(vm_config.work_dir) if vm_config.work_dir else "."
         full_path = os.path.normpath(os.path.join(effective_dir, dest_path))
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        with open(full_path, "wb") as f:
-            f.write(content)
+        await _io_call(_copy_upload, file.file, full_path)
     else:
-        # Remote: pipe base64-encoded content through stdin and decode on target
+        # Remote: stream the raw bytes into `cat` on the target (the SSH
+        # channel is binary-safe, so no base64 round trip)
         import shlex
-        b64 = base64.b64encode(content).decode("ascii")
-        runner = _get_cmd_runner_cls()(vm_config)
-        await runner.run_cmd(["bash", "-c", f"base64 -d > {shlex.quote(dest_path)}"], stdin=b64)
+        from agent.tools.ssh_exec import ssh_exec_bytes
+        await ssh_exec_bytes(
+            vm_config,
+            ["bash", "-c", f"cat > {shlex.quote(dest_path)}"],
+            stdin=file.file,
+            dir=vm_config.work_dir or None,
+        )
 
-    return {"path": dest_path, "size": len(content), "success": True}
+    return {"path": dest_path, "size": size, "success": True}
 
 
 class WriteRequest(BaseModel):
@@ -383,37 +684,56 @@ class WriteRequest(BaseModel):
     content: str
 
 
+def _write_text(full_path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+
+
 @router.post("/write")
 async def write_file(request: Request, body: WriteRequest, vm_name: str = Query(None), work_dir: str = Query(None)):
     user_id = _get_user_id(request)
-    from agent.config import resolve_vm_config
-    vm_config = resolve_vm_config(user_id, vm_name)
-    if work_dir:
-        vm_config = dataclasses.replace(vm_config, work_dir=work_dir)
+    vm_config = _get_vm_config(user_id, vm_name, work_dir)
     if not vm_config.api_token:
         # Local: write directly to disk
         effective_dir = os.path.expanduser(vm_config.work_dir) if vm_config.work_dir else "."
         full_path = os.path.normpath(os.path.join(effective_dir, body.path))
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        with open(full_path, "w") as f:
-            f.write(body.content)
+        await _io_call(_write_text, full_path, body.content)
     else:
-        # Remote: pipe base64-encoded content through stdin and decode on target
+        # Remote: raw UTF-8 into `cat` over the binary-safe SSH channel, as
+        # upload_file does
         import shlex
-        b64 = base64.b64encode(body.content.encode("utf-8")).decode("ascii")
-        runner = _get_cmd_runner_cls()(vm_config)
-        await runner.run_cmd(["bash", "-c", f"base64 -d > {shlex.quote(body.path)}"], stdin=b64)
+        from agent.tools.ssh_exec import ssh_exec_bytes
+        await ssh_exec_bytes(
+            vm_config,
+            ["bash", "-c", f"cat > {shlex.quote(body.path)}"],
+            stdin=body.content.encode("utf-8"),
+            dir=vm_config.work_dir or None,
+        )
     return {"path": body.path, "success": True}
 
 
+@lru_cache(maxsize=256)
+def _mime_by_ext(ext: str) -> str:
+    mime, _ = mimetypes.guess_type("f" + ext)
+    return mime or "application/octet-stream"
+
+
+def _guess_mime(path: str) -> str:
+    """Content type for a raw download, memoized on the lowercased extension."""
+    return _mime_by_ext(os.path.splitext(path)[1].lower())
+
+
 @router.get("/raw")
 async def raw_file(request: Request, path: str = Query(...), vm_name: str = Query(None), work_dir: str = Query(None)):
     user_id = _get_user_id(request)
     if path.startswith("/") or path.startswith("~"):
         work_dir = None
     data = await _exec_bytes(user_id, ["cat", path], timeout=30, vm_name=vm_name, work_dir=work_dir)
-    mime, _ = mimetypes.guess_type(path)
-    return Response(content=data, media_type=mime or "application/octet-stream")
+    etag = _etag(data)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=data, media_type=_guess_mime(path), headers={"ETag": etag})
 
 
 # --- PDF export (server-side WeasyPrint render) -------------------------------
@@ -446,13 +766,16 @@ class ExportPdfRequest(BaseModel):
     filename: str | None = None
 
 
+# str.translate deletion table for _pdf_content_disposition.
+_HEADER_UNSAFE = dict.fromkeys([*range(0x20), ord('"'), ord("\\")])
+
+
 def _pdf_content_disposition(filename: str | None) -> str:
-    import re
     from urllib.parse import quote
     # basename, drop control chars / quotes that would break the header value,
     # strip one trailing extension, force .pdf (mirrors the client's exportFilename)
     name = os.path.basename((filename or "").strip())
-    name = "".join(c for c in name if c >= " " and c not in '"\\')
+    name = name.translate(_HEADER_UNSAFE)
     stem = (re.sub(r"\.[^.]*$", "", name) or name).strip() or "export"
     full = f"{stem}.pdf"
     ascii_stem = stem.encode("ascii", "ignore").decode().strip()
@@ -466,10 +789,7 @@ async def export_pdf(request: Request, body: ExportPdfRequest, vm_name: str = Qu
     if not body.html or not body.html.strip():
         raise HTTPException(status_code=400, detail="Missing HTML payload")
 
-    from agent.config import resolve_vm_config
-    vm_config = resolve_vm_config(user_id, vm_name)
-    if work_dir:
-        vm_config = dataclasses.replace(vm_config, work_dir=work_dir)
+    vm_config = _get_vm_config(user_id, vm_name, work_dir)
     runner = _get_cmd_runner_cls()(vm_config)
     try:
         output = await runner.run_cmd(
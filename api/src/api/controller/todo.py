@@ -3,6 +3,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 
+from api.util.response import UnicodeJSONResponse
 from storage.service import todo as todo_service
 
 router = APIRouter(prefix="/todo")
@@ -81,7 +82,8 @@ async def list_todos(
             item["has_running"] = cs.get("has_running", False)
             item["has_unread"] = cs.get("has_unread", False)
 
-    return result
+    # Plain dicts already: skip FastAPI's jsonable_encoder pass over them.
+    return UnicodeJSONResponse(result)
 
 
 @router.get("/detail")
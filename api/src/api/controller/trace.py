@@ -40,19 +40,8 @@ async def list_traces(request: Request, trace_id: str = Query(None), offset: int
     """List distinct trace_ids from chats, ordered by most recent. Includes todo name."""
     user_id = _get_user_id(request)
     from storage.repository.chat import list_trace_ids
-    traces = list_trace_ids(user_id, limit=limit, offset=offset, trace_id=trace_id)
-
-    # Batch-lookup todo names for all trace_ids (trace_id = todo_id)
-    trace_ids = [t["trace_id"] for t in traces]
-    if trace_ids:
-        from storage.repository.todo import find_todos_by_ids
-        todo_map = find_todos_by_ids(user_id, trace_ids)
-        for t in traces:
-            todo = todo_map.get(t["trace_id"])
-            t["todo_name"] = todo.name if todo else None
-            t["todo_status"] = todo.status if todo else None
-
-    return traces
+    # todo name/status come back joined in (trace_id = todo_id)
+    return list_trace_ids(user_id, limit=limit, offset=offset, trace_id=trace_id)
 
 
 @router.get("/latest_chat")
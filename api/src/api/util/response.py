@@ -0,0 +1,29 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None
+
+
+class UnicodeJSONResponse(JSONResponse):
+    """The app's default response class: compact UTF-8 JSON, no \\u escapes.
+
+    Routes that build large lists of plain dicts can return one directly to
+    skip FastAPI's jsonable_encoder walk, which costs far more than the
+    encoding itself.
+    """
+
+    def render(self, content: Any) -> bytes:
+        # orjson writes UTF-8 bytes directly, which matters for large list
+        # payloads (/file/list, /calendar/list). Anything it refuses
+        # (e.g. ints beyond 64 bits) goes through json.dumps as before.
+        if orjson is not None:
+            try:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass
+        return json.dumps(content, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,59 @@
+"""Tests for the ETag revalidation on /file/raw and /file/read in
+api.controller.file.
+
+Plain unittest (no pytest) so this runs under the CI unittest runner.
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from api.controller import file as file_controller
+
+
+class ETagTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(file_controller, "_get_user_id", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_raw_not_modified_when_tag_matches(self):
+        with patch.object(file_controller, "_exec_bytes", AsyncMock(return_value=b"body")):
+            first = asyncio.run(file_controller.raw_file(
+                SimpleNamespace(headers={}), path="a.txt", vm_name=None, work_dir=None,
+            ))
+            etag = first.headers["etag"]
+            again = asyncio.run(file_controller.raw_file(
+                SimpleNamespace(headers={"if-none-match": f'"other", W/{etag}'}),
+                path="a.txt", vm_name=None, work_dir=None,
+            ))
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.body, b"")
+        self.assertEqual(again.headers["etag"], etag)
+
+    def test_read_sets_etag_and_revalidates(self):
+        from fastapi import Response
+
+        with patch.object(file_controller, "_exec", AsyncMock(return_value="hello")):
+            response = Response()
+            body = asyncio.run(file_controller.read_file(
+                SimpleNamespace(headers={}), response, path="a.txt", vm_name=None, work_dir=None,
+            ))
+            self.assertEqual(body, {"path": "a.txt", "content": "hello"})
+            etag = response.headers["etag"]
+
+            unchanged = asyncio.run(file_controller.read_file(
+                SimpleNamespace(headers={"if-none-match": etag}), Response(), path="a.txt", vm_name=None, work_dir=None,
+            ))
+            self.assertEqual(unchanged.status_code, 304)
+
+        with patch.object(file_controller, "_exec", AsyncMock(return_value="changed")):
+            changed = asyncio.run(file_controller.read_file(
+                SimpleNamespace(headers={"if-none-match": etag}), Response(), path="a.txt", vm_name=None, work_dir=None,
+            ))
+        self.assertEqual(changed["content"], "changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests for api.controller.file's vscode exclude handling: the short TTL
+cache around settings.json reads and the compiled exclude matcher used by
+/file/list and /file/search, plus /file/list's parsing of the ls output.
+
+Plain unittest (no pytest) so this runs under the CI unittest runner.
+"""
+
+import asyncio
+import fnmatch
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from api.controller import file as file_controller
+
+
+class VscodeExcludesCacheTest(unittest.TestCase):
+    def setUp(self):
+        file_controller._excludes_cache.clear()
+        self.addCleanup(file_controller._excludes_cache.clear)
+
+    def test_settings_read_once_within_ttl(self):
+        settings = json.dumps({"files.exclude": {"**/node_modules": True, "**/.git": False}})
+        exec_mock = AsyncMock(return_value=settings)
+        with patch.object(file_controller, "_exec", exec_mock):
+            first = asyncio.run(file_controller._get_vscode_excludes(1, None, "files.exclude"))
+            second = asyncio.run(file_controller._get_vscode_excludes(1, None, "files.exclude"))
+        self.assertEqual(first, ["node_modules"])
+        self.assertEqual(second, first)
+        exec_mock.assert_awaited_once()
+
+    def test_expired_or_different_key_rereads(self):
+        exec_mock = AsyncMock(side_effect=FileNotFoundError)
+        with patch.object(file_controller, "_exec", exec_mock):
+            self.assertEqual(asyncio.run(file_controller._get_vscode_excludes(1, None, "files.exclude")), [])
+            asyncio.run(file_controller._get_vscode_excludes(1, "ssh:vm", "files.exclude"))
+            with patch.object(file_controller, "_EXCLUDES_TTL", 0):
+                asyncio.run(file_controller._get_vscode_excludes(1, None, "files.exclude"))
+        self.assertEqual(exec_mock.await_count, 3)
+
+    def test_cache_is_capped(self):
+        with patch.object(file_controller, "_exec", AsyncMock(return_value="{}")), \
+                patch.object(file_controller, "_TTL_CACHE_MAX", 3):
+            for work_dir in ("a", "b", "c", "d", "e"):
+                asyncio.run(file_controller._get_vscode_excludes(1, None, "files.exclude", work_dir=work_dir))
+        self.assertEqual([k[2] for k in file_controller._excludes_cache], ["c", "d", "e"])
+
+    def test_full_cache_drops_expired_entries_first(self):
+        cache = {("old",): (0.0, []), ("live",): (9.0, [])}
+        with patch.object(file_controller, "_TTL_CACHE_MAX", 2):
+            file_controller._ttl_cache_put(cache, ("new",), [], ttl=5.0, now=10.0)
+        self.assertEqual(list(cache), [("live",), ("new",)])
+
+
+class ExcludeMatcherTest(unittest.TestCase):
+    def test_matches_like_fnmatch(self):
+        patterns = ["node_modules", "*.pyc", ".git", "build*"]
+        is_excluded = file_controller._exclude_matcher(patterns)
+        for name in ["node_modules", "a.pyc", ".git", ".gitignore", "build", "builds", "src", "x.pyc.bak"]:
+            self.assertEqual(
+                bool(is_excluded(name)),
+                any(fnmatch.fnmatch(name, pat) for pat in patterns),
+                name,
+            )
+
+    def test_no_patterns_gives_no_matcher(self):
+        self.assertIsNone(file_controller._exclude_matcher([]))
+
+
+class ListFilesTest(unittest.TestCase):
+    def setUp(self):
+        file_controller._excludes_cache.clear()
+        self.addCleanup(file_controller._excludes_cache.clear)
+
+    def _list(self, listing: str, settings: str = "{}"):
+        async def fake_exec(user_id, cmd, **kwargs):
+            return settings if cmd[1] == ".vscode/settings.json" else listing
+
+        # A remote VM: local ones list with scandir instead of parsing ls.
+        remote = SimpleNamespace(api_token="token", work_dir=None)
+        with patch.object(file_controller, "_exec", fake_exec), \
+                patch.object(file_controller, "_get_vm_config", return_value=remote), \
+                patch.object(file_controller, "_get_user_id", return_value=1):
+            result = asyncio.run(file_controller.list_files(None, path=".", vm_name=None, work_dir=None, sort=None))
+        return result["entries"]
+
+    def test_parses_dirs_and_files(self):
+        entries = self._list("./\n../\nsrc/\n.env\na.py\n")
+        self.assertEqual(entries, [
+            {"name": "src", "type": "directory"},
+            {"name": ".env", "type": "file"},
+            {"name": "a.py", "type": "file"},
+        ])
+
+    def test_drops_control_char_names_and_excludes(self):
+        settings = json.dumps({"files.exclude": {"**/node_modules": True}})
+        entries = self._list("node_modules/\nbad\x1cname\ntab\tname\nok\n", settings)
+        self.assertEqual(entries, [{"name": "ok", "type": "file"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
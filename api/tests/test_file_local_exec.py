@@ -0,0 +1,126 @@
+"""Tests for api.controller.file's in-process fast paths on local VMs (no
+api_token), which must match what the equivalent subprocess would return.
+
+Plain unittest (no pytest) so this runs under the CI unittest runner.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from api.controller import file as file_controller
+
+
+class LocalCatTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        os.mkdir(os.path.join(self.tmp.name, "sub"))
+        with open(os.path.join(self.tmp.name, "a.txt"), "wb") as f:
+            f.write("hé\n".encode())
+        config = SimpleNamespace(api_token=None, work_dir=self.tmp.name)
+        patcher = patch.object(file_controller, "_get_vm_config", return_value=config)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_without_a_subprocess(self):
+        with patch("asyncio.create_subprocess_exec") as spawn:
+            text = asyncio.run(file_controller._exec(1, ["cat", "a.txt"]))
+            data = asyncio.run(file_controller._exec_bytes(1, ["cat", "a.txt"]))
+        spawn.assert_not_called()
+        self.assertEqual(text, "hé\n")
+        self.assertEqual(data, "hé\n".encode())
+
+    def test_errors_read_like_cat_output(self):
+        self.assertEqual(
+            asyncio.run(file_controller._exec(1, ["cat", "missing"])),
+            "cat: missing: No such file or directory\n",
+        )
+        self.assertEqual(
+            asyncio.run(file_controller._exec_bytes(1, ["cat", "sub"])),
+            b"cat: sub: Is a directory\n",
+        )
+
+    def test_special_and_large_files_use_the_subprocess(self):
+        os.mkfifo(os.path.join(self.tmp.name, "pipe"))
+        self.assertIsNone(file_controller._local_cat("pipe", self.tmp.name))
+        with patch.object(file_controller, "_LOCAL_CAT_MAX", 2):
+            self.assertIsNone(file_controller._local_cat("a.txt", self.tmp.name))
+            self.assertEqual(
+                asyncio.run(file_controller._exec_bytes(1, ["cat", "a.txt"])),
+                "hé\n".encode(),
+            )
+
+
+class LocalListTest(unittest.TestCase):
+    def setUp(self):
+        file_controller._excludes_cache.clear()
+        self.addCleanup(file_controller._excludes_cache.clear)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        os.makedirs(os.path.join(root, "src", "pkg"))
+        os.makedirs(os.path.join(root, "src", "node_modules"))
+        for name in ("b.py", ".env", "bad\nname"):
+            open(os.path.join(root, "src", name), "w").close()
+        os.symlink("pkg", os.path.join(root, "src", "link"))
+        os.makedirs(os.path.join(root, ".vscode"))
+        with open(os.path.join(root, ".vscode", "settings.json"), "w") as f:
+            f.write('{"files.exclude": {"**/node_modules": true}}')
+        config = SimpleNamespace(api_token=None, work_dir=root)
+        for target, kwargs in (("_get_vm_config", {"return_value": config}), ("_get_user_id", {"return_value": 1})):
+            patcher = patch.object(file_controller, target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _list(self, path: str):
+        with patch("asyncio.create_subprocess_exec") as spawn:
+            result = asyncio.run(file_controller.list_files(None, path=path, vm_name=None, work_dir=None, sort=None))
+        spawn.assert_not_called()
+        return result["entries"]
+
+    def test_lists_like_ls(self):
+        self.assertEqual(self._list("src"), [
+            {"name": ".env", "type": "file"},
+            {"name": "b.py", "type": "file"},
+            {"name": "link", "type": "directory"},
+            {"name": "pkg", "type": "directory"},
+        ])
+
+    def test_missing_path_is_empty(self):
+        self.assertEqual(self._list("nope"), [])
+
+
+class LocalSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        deep = os.path.join(root, *"abcdefgh")
+        for d in ("src/node_modules", ".hidden", deep):
+            os.makedirs(os.path.join(root, d), exist_ok=True)
+        for f in ("src/Foo.py", "src/node_modules/foo.js", ".hidden/foo", "foo.pyc",
+                  os.path.join(*"abcdefg", "foo8"), os.path.join(deep, "foo9")):
+            open(os.path.join(root, f), "w").close()
+        os.symlink("src/Foo.py", os.path.join(root, "foolink"))
+
+    def _search(self, q, path=".", excludes=("node_modules", "*.pyc")):
+        return sorted(file_controller._local_search(q, path, self.tmp.name, list(excludes)))
+
+    def test_matches_find_semantics(self):
+        # Case-insensitive, hidden files included, excludes pruned, symlinks
+        # skipped, at most 8 levels deep.
+        self.assertEqual(self._search("foo"), [".hidden/foo", "a/b/c/d/e/f/g/foo8", "src/Foo.py"])
+        self.assertEqual(self._search("foo", path="src"), ["src/Foo.py"])
+
+    def test_stops_at_fifty_hits(self):
+        for i in range(60):
+            open(os.path.join(self.tmp.name, f"hit{i}"), "w").close()
+        self.assertEqual(len(self._search("hit")), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
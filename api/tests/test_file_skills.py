@@ -0,0 +1,53 @@
+"""Tests for api.controller.file's /file/skills listing, run through the real
+bash/awk script on a local VM.
+
+Plain unittest (no pytest) so this runs under the CI unittest runner.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from api.controller import file as file_controller
+
+
+class ListSkillsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        config = SimpleNamespace(api_token=None, work_dir=None)
+        for target, kwargs in (("_get_vm_config", {"return_value": config}), ("_get_user_id", {"return_value": 1})):
+            patcher = patch.object(file_controller, target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _skills(self, skills_dir: str):
+        with patch.object(file_controller, "_SKILLS_DIR", skills_dir):
+            return asyncio.run(file_controller.list_skills(None, vm_name=None))["skills"]
+
+    def test_lists_every_skill_including_empty_ones(self):
+        root = self.tmp.name
+        for name, body in (
+            ("alpha", "---\nname: alpha\ndescription: Does alpha\n---\n"),
+            ("empty", ""),
+            ("plain", "no front matter\n"),
+        ):
+            os.mkdir(os.path.join(root, name))
+            with open(os.path.join(root, name, "SKILL.md"), "w") as f:
+                f.write(body)
+        os.mkdir(os.path.join(root, "no-skill-file"))
+
+        self.assertEqual(
+            [(s["name"], s["description"]) for s in self._skills(root)],
+            [("alpha", "Does alpha"), ("empty", ""), ("plain", "")],
+        )
+
+    def test_missing_dir_lists_nothing(self):
+        self.assertEqual(self._skills(os.path.join(self.tmp.name, "missing")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
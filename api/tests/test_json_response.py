@@ -0,0 +1,26 @@
+"""Tests for api.util.response.UnicodeJSONResponse, the app's default
+response class.
+
+Plain unittest (no pytest) so this runs under the CI unittest runner.
+"""
+
+import json
+import unittest
+
+from api.util.response import UnicodeJSONResponse
+
+
+class UnicodeJSONResponseTest(unittest.TestCase):
+    def test_non_ascii_is_not_escaped(self):
+        body = UnicodeJSONResponse([{"name": "日程", "done": False, "n": None}]).body
+        self.assertIn("日程".encode("utf-8"), body)
+        self.assertEqual(json.loads(body), [{"name": "日程", "done": False, "n": None}])
+
+    def test_non_str_keys_and_big_ints(self):
+        self.assertEqual(json.loads(UnicodeJSONResponse({1: "a"}).body), {"1": "a"})
+        # Beyond 64 bits orjson refuses; the stdlib fallback handles it.
+        self.assertEqual(json.loads(UnicodeJSONResponse({"n": 2 ** 70}).body), {"n": 2 ** 70})
+
+
+if __name__ == "__main__":
+    unittest.main()
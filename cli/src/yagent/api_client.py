@@ -1,23 +1,59 @@
 """API client for authenticated requests to the y-agent API."""
 
+import atexit
 import json
 import os
 import sys
+import threading
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json fallback
+    orjson = None
+
 
 AUTH_FILE = os.path.join(os.path.expanduser(os.getenv("Y_AGENT_HOME", "~/.y-agent")), "auth.json")
 DEFAULT_WEB_URL = "https://yovy.app"
 
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """Shared client so consecutive requests reuse a keep-alive connection
+    instead of paying DNS + TCP + TLS setup on every call."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(timeout=30)
+                atexit.register(_client.close)
+    return _client
+
+
+_auth_cache: tuple[int, dict] | None = None
+
 
 def load_auth() -> dict:
-    """Load auth credentials from auth.json. Returns dict with token, email, api_url."""
-    if not os.path.exists(AUTH_FILE):
+    """Load auth credentials from auth.json. Returns dict with token, email, api_url.
+
+    The parsed file is reused while its mtime is unchanged, so a command that
+    makes several requests reads it once.
+    """
+    global _auth_cache
+    try:
+        mtime = os.stat(AUTH_FILE).st_mtime_ns
+    except FileNotFoundError:
         print("Not logged in. Run 'y login' first.", file=sys.stderr)
         sys.exit(1)
+    if _auth_cache is not None and _auth_cache[0] == mtime:
+        return _auth_cache[1]
     with open(AUTH_FILE) as f:
-        return json.load(f)
+        auth = json.load(f)
+    _auth_cache = (mtime, auth)
+    return auth
 
 
 def save_auth(token: str, email: str, web_url: str):
@@ -57,7 +93,7 @@ def api_request(method: str, path: str, **kwargs) -> httpx.Response:
     url = f"{api_url}{path}"
     headers = {"Authorization": f"Bearer {token}"}
 
-    resp = httpx.request(method, url, headers=headers, timeout=30, **kwargs)
+    resp = _get_client().request(method, url, headers=headers, **kwargs)
 
     if resp.status_code == 401:
         print("Session expired. Run 'y login' to re-authenticate.", file=sys.stderr)
@@ -65,3 +101,10 @@ def api_request(method: str, path: str, **kwargs) -> httpx.Response:
 
     resp.raise_for_status()
     return resp
+
+
+def response_json(resp: httpx.Response):
+    """Decode a JSON response body; orjson parses the raw bytes directly."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
@@ -4,7 +4,7 @@ import os
 from datetime import datetime, timedelta
 
 from yagent.api_client import api_request
-from yagent.time_util import utc_to_local, local_to_utc, local_date_to_utc_range
+from yagent.time_util import utc_to_local, local_date_to_utc_range
 
 
 def _agent_home() -> str:
@@ -15,17 +15,17 @@ def update_dashboard() -> str:
     """Regenerate calendar.md dashboard. Returns the file path."""
     home = _agent_home()
 
-    # Today's events
-    today = datetime.now().strftime("%Y-%m-%d")
-    today_start, today_end = local_date_to_utc_range(today)
-    resp = api_request("GET", "/api/calendar/list", params={"start": today_start, "end": today_end, "limit": 100})
-    today_events = resp.json()
-
-    # Upcoming 7 days
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%dT00:00")
-    week_end = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%dT23:59")
-    resp = api_request("GET", "/api/calendar/list", params={"start": local_to_utc(tomorrow), "end": local_to_utc(week_end), "limit": 100})
-    upcoming = resp.json()
+    # Today plus the next 7 days in one request, split locally. `from`/`to`
+    # are local dates; the date form of `to` covers that whole day.
+    now = datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    week_end = (now + timedelta(days=7)).strftime("%Y-%m-%d")
+    _, today_end = local_date_to_utc_range(today)
+    resp = api_request("GET", "/api/calendar/list", params={"from": today, "to": week_end, "limit": 200})
+    events = resp.json()
+    # Both sides are UTC ISO 8601 with a Z suffix, so they compare as strings.
+    today_events = [e for e in events if e["start_time"] < today_end]
+    upcoming = [e for e in events if e["start_time"] >= today_end]
 
     # Build markdown
     lines = ["# Calendar Dashboard", ""]
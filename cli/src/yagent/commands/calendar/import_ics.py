@@ -1,4 +1,6 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import click
 from storage.service import calendar_event as cal_service
 from storage.service.user import get_cli_user_id
@@ -6,7 +8,9 @@ from storage.service.user import get_cli_user_id
 
 @click.command('import')
 @click.option('--dir', '-d', 'ics_dir', default=None, help='Directory containing .ics files (default: $Y_AGENT_HOME/assets/calendar/ics)')
-def calendar_import(ics_dir):
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='Worker processes for parsing ICS files (default: CPU count)')
+def calendar_import(ics_dir, jobs):
     """Import events from ICS files."""
     if not ics_dir:
         agent_home = os.path.expanduser(os.getenv("Y_AGENT_HOME", "~/.y-agent"))
@@ -17,5 +21,13 @@ def calendar_import(ics_dir):
         return
 
     user_id = get_cli_user_id()
-    count = cal_service.import_ics(user_id, ics_dir)
+    ics_files = cal_service.list_ics_files(ics_dir)
+    # Files parse independently, so spread parsing across processes; events
+    # are saved from this process as each file's result arrives, in order.
+    workers = min(jobs or os.cpu_count() or 1, len(ics_files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            count = cal_service.save_parsed_events(user_id, pool.map(cal_service.parse_ics_file, ics_files))
+    else:
+        count = cal_service.save_parsed_events(user_id, map(cal_service.parse_ics_file, ics_files))
     click.echo(f"Imported {count} events from {ics_dir}")
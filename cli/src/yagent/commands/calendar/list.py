@@ -49,4 +49,10 @@ def calendar_list(on, from_, to, created_on, created_from, created_to,
             "Yes" if e.get("all_day") else "No",
             e.get("status", ""),
         ])
-    click.echo(tabulate(table, headers=["ID", "Summary", "Start", "End", "All Day", "Status"], tablefmt="simple"))
+    # Every cell is already a display string; skipping tabulate's per-cell
+    # number sniffing halves render time on long lists and keeps hex IDs
+    # like "123456" or "1e5432" left-aligned with the rest.
+    click.echo(tabulate(
+        table, headers=["ID", "Summary", "Start", "End", "All Day", "Status"],
+        tablefmt="simple", disable_numparse=True,
+    ))
@@ -1,6 +1,8 @@
 """Import Claude Code conversation history from ~/.claude/projects/ into y-agent."""
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import click
 
 from sqlalchemy import inspect as sa_inspect, text
@@ -12,48 +14,60 @@ from storage.entity.dto import Chat
 from storage.repository.chat import find_external_id_map, _extract_title
 from storage.database.base import get_db
 from storage.service.user import get_cli_user_id
-from agent.claude_code import convert_history_session, _iso_to_unix_ms
+from agent.claude_code import convert_history_session, _dumps, _iso_to_unix_ms
 from yagent.config import config  # noqa: F401 - triggers DB init
 
 
-def _upsert_import_chat(user_id: int, chat: Chat, existing_chat_id: str | None = None, file_mtime_ms: int | None = None):
-    """Insert or update an imported chat, preserving session timestamps.
+_INSERT_SQL = text(
+    "INSERT INTO chat (user_id, chat_id, title, external_id, backend, origin_chat_id, json_content,"
+    " created_at, updated_at, created_at_unix, updated_at_unix)"
+    " VALUES (:uid, :cid, :title, :eid, :backend, :ocid, :jc, :ca, :ua, :cau, :uau)"
+)
+_UPDATE_SQL = text(
+    "UPDATE chat SET title = :title, json_content = :jc,"
+    " updated_at = :ua, updated_at_unix = :uau"
+    " WHERE chat_id = :cid"
+)
+
+# Chats written per transaction. Batching amortizes the commit; the cap keeps
+# the pending json_content (whole sessions) from piling up in memory.
+_UPSERT_BATCH = 50
+
 
-    Uses raw SQL to bypass SQLAlchemy's default/onupdate hooks.
+def _upsert_params(user_id: int, chat: Chat, existing_chat_id: str | None = None, file_mtime_ms: int | None = None) -> dict:
+    """Bind parameters for _INSERT_SQL (new chat) or _UPDATE_SQL (existing_chat_id).
+
+    The statements are raw SQL to bypass SQLAlchemy's default/onupdate hooks,
+    preserving session timestamps.
     """
     params = {
         "title": _extract_title(chat),
         "eid": chat.external_id,
         "backend": chat.backend,
         "ocid": chat.origin_chat_id,
-        "jc": json.dumps(chat.to_dict()),
+        "jc": _dumps(chat.to_dict()),
         "ca": chat.create_time,
         "ua": chat.update_time,
         "cau": _iso_to_unix_ms(chat.create_time),
         "uau": file_mtime_ms or _iso_to_unix_ms(chat.update_time),
     }
+    if existing_chat_id:
+        params["cid"] = existing_chat_id
+    else:
+        params["uid"] = user_id
+        params["cid"] = chat.id
+    return params
+
+
+def _write_upserts(inserts: list[dict], updates: list[dict]) -> None:
+    """Run the pending inserts/updates as executemany calls in one transaction."""
+    if not inserts and not updates:
+        return
     with get_db() as session:
-        if existing_chat_id:
-            params["cid"] = existing_chat_id
-            session.execute(
-                text(
-                    "UPDATE chat SET title = :title, json_content = :jc,"
-                    " updated_at = :ua, updated_at_unix = :uau"
-                    " WHERE chat_id = :cid"
-                ),
-                params,
-            )
-        else:
-            params["uid"] = user_id
-            params["cid"] = chat.id
-            session.execute(
-                text(
-                    "INSERT INTO chat (user_id, chat_id, title, external_id, backend, origin_chat_id, json_content,"
-                    " created_at, updated_at, created_at_unix, updated_at_unix)"
-                    " VALUES (:uid, :cid, :title, :eid, :backend, :ocid, :jc, :ca, :ua, :cau, :uau)"
-                ),
-                params,
-            )
+        if inserts:
+            session.execute(_INSERT_SQL, inserts)
+        if updates:
+            session.execute(_UPDATE_SQL, updates)
 
 
 def _ensure_columns():
@@ -68,12 +82,15 @@ def _ensure_columns():
         if "backend" not in columns:
             session.execute(text("ALTER TABLE chat ADD COLUMN backend VARCHAR"))
             click.echo("Added backend column to chat table")
-        # Backfill external_id/backend from json_content (Python-side to handle malformed JSON)
+        # Backfill external_id/backend from json_content (Python-side to handle malformed JSON).
+        # Rows without an external_id are stamped with '' so later runs only
+        # parse chats written since, instead of every non-imported chat again.
         rows = session.execute(text(
             "SELECT chat_id, json_content FROM chat"
-            " WHERE external_id IS NULL OR backend IS NULL"
+            " WHERE external_id IS NULL OR (backend IS NULL AND external_id <> '')"
         )).fetchall()
-        count = 0
+        claimed = []
+        blank = []
         skipped = 0
         for chat_id, jc in rows:
             try:
@@ -85,22 +102,41 @@ def _ensure_columns():
                 ), {"cid": chat_id})
                 continue
             if eid:
-                session.execute(text(
-                    "UPDATE chat SET external_id = :eid, backend = 'claude_code'"
-                    " WHERE chat_id = :cid"
-                ), {"eid": eid, "cid": chat_id})
-                count += 1
+                claimed.append({"eid": eid, "cid": chat_id})
+            else:
+                blank.append({"cid": chat_id})
+        if claimed:
+            session.execute(text(
+                "UPDATE chat SET external_id = :eid, backend = 'claude_code'"
+                " WHERE chat_id = :cid"
+            ), claimed)
+        if blank:
+            session.execute(text(
+                "UPDATE chat SET external_id = '' WHERE chat_id = :cid AND external_id IS NULL"
+            ), blank)
         if skipped:
             click.echo(f"Skipped {skipped} chats with malformed json_content")
-        if count:
-            click.echo(f"Backfilled {count} existing chats with external_id/backend")
+        if claimed:
+            click.echo(f"Backfilled {len(claimed)} existing chats with external_id/backend")
+
+
+def _convert_file(filepath: str):
+    """Convert one session file; runs in a worker process.
+
+    Lines are streamed from the binary file into the parser, so peak memory
+    is one line plus the converted messages rather than the whole file.
+    """
+    with open(filepath, "rb") as f:
+        return convert_history_session(f)
 
 
 @click.command("import-claude")
 @click.option("--source", default="~/.claude/projects", help="Path to Claude projects dir")
 @click.option("--project", "-p", default=None, help="Only import a specific project subfolder")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed information")
-def import_claude(source: str, project: str | None, verbose: bool):
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="Worker processes for converting sessions (default: CPU count)")
+def import_claude(source: str, project: str | None, verbose: bool, jobs: int | None):
     """Import Claude Code history into y-agent (re-runnable / incremental)."""
     _ensure_columns()
 
@@ -120,16 +156,14 @@ def import_claude(source: str, project: str | None, verbose: bool):
             raise click.Abort()
         projects = [(project, proj_dir)]
     else:
-        projects = []
-        for name in sorted(os.listdir(source)):
-            d = os.path.join(source, name)
-            if os.path.isdir(d):
-                projects.append((name, d))
+        # scandir's DirEntry answers is_dir() from the directory read itself
+        with os.scandir(source) as it:
+            projects = sorted((e.name, e.path) for e in it if e.is_dir())
 
     for proj_name, proj_dir in projects:
-        for fname in sorted(os.listdir(proj_dir)):
-            if fname.endswith(".jsonl"):
-                jsonl_files.append((proj_name, os.path.join(proj_dir, fname)))
+        with os.scandir(proj_dir) as it:
+            names = sorted((e.name, e.path) for e in it if e.name.endswith(".jsonl"))
+        jsonl_files.extend((proj_name, path) for _, path in names)
 
     if verbose:
         click.echo(f"Found {len(jsonl_files)} JSONL files across {len(projects)} project(s)")
@@ -144,6 +178,8 @@ def import_claude(source: str, project: str | None, verbose: bool):
     skip_count = 0
     error_count = 0
 
+    # Stat pass: unchanged sessions never reach the converter
+    pending = []  # (proj_name, fname, external_id, file_mtime_ms, filepath)
     for proj_name, filepath in jsonl_files:
         fname = os.path.basename(filepath)
         session_uuid = fname.removesuffix(".jsonl")
@@ -151,7 +187,6 @@ def import_claude(source: str, project: str | None, verbose: bool):
 
         try:
             existing_entry = existing_map.get(external_id)
-            existing_chat_id = existing_entry[0] if existing_entry else None
             file_mtime_ms = int(os.path.getmtime(filepath) * 1000)
 
             # Skip files not modified since last import
@@ -161,50 +196,104 @@ def import_claude(source: str, project: str | None, verbose: bool):
                     if verbose:
                         click.echo(f"  skip (unchanged): {proj_name}/{fname}")
                     continue
+        except Exception as e:
+            error_count += 1
+            click.echo(f"  ERROR: {proj_name}/{fname}: {e}")
+            continue
 
-            with open(filepath, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+        pending.append((proj_name, fname, external_id, file_mtime_ms, filepath))
 
-            messages, session_id, work_dir = convert_history_session(lines)
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    batch_names: list[str] = []
 
-            if not messages:
-                skip_count += 1
-                if verbose:
-                    click.echo(f"  skip (empty): {proj_name}/{fname}")
-                continue
+    def flush():
+        """Write the pending batch; on failure count every chat in it as an error."""
+        nonlocal new_count, updated_count, error_count
+        try:
+            _write_upserts(inserts, updates)
+        except Exception as e:
+            new_count -= len(inserts)
+            updated_count -= len(updates)
+            error_count += len(batch_names)
+            click.echo(f"  ERROR: writing {', '.join(batch_names)}: {e}")
+        inserts.clear()
+        updates.clear()
+        batch_names.clear()
 
-            first_ts = messages[0].timestamp
-            last_ts = messages[-1].timestamp
-
-            chat = Chat(
-                id=existing_chat_id or generate_id(),
-                create_time=first_ts,
-                update_time=last_ts,
-                messages=messages,
-                external_id=external_id,
-                backend="claude_code",
-                work_dir=work_dir,
-            )
-
-            _upsert_import_chat(user_id, chat, existing_chat_id, file_mtime_ms)
-
-            if existing_chat_id:
-                updated_count += 1
-                if verbose:
-                    click.echo(f"  updated: {proj_name}/{fname} -> {existing_chat_id} ({len(messages)} msgs)")
-            else:
-                existing_map[external_id] = (chat.id, None)
-                new_count += 1
-                if verbose:
-                    title = ""
-                    for m in messages:
-                        if m.role == "user":
-                            title = (m.content[:80] if isinstance(m.content, str) else "")
-                            break
-                    click.echo(f"  imported: {proj_name}/{fname} -> {chat.id} ({len(messages)} msgs) {title}")
+    # Sessions are independent, so convert whole files across processes;
+    # DB writes stay on this process, in the original order. Only a window of
+    # conversions is in flight, so finished sessions don't pile up in memory
+    # ahead of the writer.
+    workers = min(jobs or os.cpu_count() or 1, len(pending))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    window = 2 * workers
+    futures = {}
 
-        except Exception as e:
-            error_count += 1
-            click.echo(f"  ERROR: {proj_name}/{fname}: {e}")
+    def submit(j: int):
+        if pool and j < len(pending):
+            futures[j] = pool.submit(_convert_file, pending[j][4])
+
+    try:
+        for j in range(window):
+            submit(j)
+
+        for i, (proj_name, fname, external_id, file_mtime_ms, filepath) in enumerate(pending):
+            try:
+                # Resolved here, not in the stat pass, so a session UUID seen
+                # in two project dirs updates the chat inserted for the first.
+                existing_entry = existing_map.get(external_id)
+                existing_chat_id = existing_entry[0] if existing_entry else None
+
+                if pool:
+                    future = futures.pop(i)
+                    submit(i + window)
+                    messages, session_id, work_dir = future.result()
+                else:
+                    messages, session_id, work_dir = _convert_file(filepath)
+
+                if not messages:
+                    skip_count += 1
+                    if verbose:
+                        click.echo(f"  skip (empty): {proj_name}/{fname}")
+                    continue
+
+                first_ts = messages[0].timestamp
+                last_ts = messages[-1].timestamp
+
+                chat = Chat(
+                    id=existing_chat_id or generate_id(),
+                    create_time=first_ts,
+                    update_time=last_ts,
+                    messages=messages,
+                    external_id=external_id,
+                    backend="claude_code",
+                    work_dir=work_dir,
+                )
+
+                params = _upsert_params(user_id, chat, existing_chat_id, file_mtime_ms)
+                (updates if existing_chat_id else inserts).append(params)
+                batch_names.append(f"{proj_name}/{fname}")
+
+                if existing_chat_id:
+                    updated_count += 1
+                    if verbose:
+                        click.echo(f"  updated: {proj_name}/{fname} -> {existing_chat_id} ({len(messages)} msgs)")
+                else:
+                    existing_map[external_id] = (chat.id, None)
+                    new_count += 1
+                    if verbose:
+                        click.echo(f"  imported: {proj_name}/{fname} -> {chat.id} ({len(messages)} msgs) {params['title'][:80]}")
+
+            except Exception as e:
+                error_count += 1
+                click.echo(f"  ERROR: {proj_name}/{fname}: {e}")
+
+            if len(batch_names) >= _UPSERT_BATCH:
+                flush()
+        flush()
+    finally:
+        if pool:
+            pool.shutdown()
 
     click.echo(f"Import completed: {new_count} new, {updated_count} updated, {skip_count} skipped, {error_count} errors")
@@ -1,5 +1,4 @@
 import click
-import numpy as np
 from pathlib import Path
 from PIL import Image
 
@@ -22,11 +21,13 @@ def collect_images(paths):
 
 def to_gray(img):
     """Convert PIL Image to grayscale float32 numpy array."""
+    import numpy as np
     return np.array(img.convert('L')).astype(np.float32)
 
 
 def find_common_header(imgs):
     """Find how many rows from the top are identical across all images."""
+    import numpy as np
     arrays = [to_gray(img) for img in imgs]
     min_h = min(a.shape[0] for a in arrays)
     limit = min_h // 3
@@ -43,6 +44,7 @@ def find_common_header(imgs):
 
 def find_common_footer(imgs):
     """Find how many rows from the bottom are identical across all images."""
+    import numpy as np
     arrays = [to_gray(img) for img in imgs]
     min_h = min(a.shape[0] for a in arrays)
     limit = min_h // 3
@@ -63,6 +65,7 @@ def find_overlap(top_img, bot_img, min_h=20):
     Compares grayscale values in the center chat area only (excluding left/right
     edges where background patterns may differ). Uses multi-block consensus voting.
     """
+    import numpy as np
     top_gray = to_gray(top_img)
     bot_gray = to_gray(bot_img)
 
@@ -2,6 +2,7 @@
 
 import os
 import socket
+import threading
 import webbrowser
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
@@ -18,6 +19,12 @@ class _CallbackHandler(BaseHTTPRequestHandler):
     email = None
 
     def do_GET(self):
+        # Browsers also probe /favicon.ico and the like; answer those empty.
+        if not self.path.startswith("/callback"):
+            self.send_response(204)
+            self.end_headers()
+            return
+
         parsed = urlparse(self.path)
         params = parse_qs(parsed.query)
 
@@ -31,6 +38,7 @@ class _CallbackHandler(BaseHTTPRequestHandler):
             self.send_header("Content-Type", "text/html")
             self.end_headers()
             self.wfile.write(b"<html><body><h2>Login successful! You can close this tab.</h2></body></html>")
+            self.server.done.set()
         else:
             self.send_response(400)
             self.send_header("Content-Type", "text/html")
@@ -41,6 +49,10 @@ class _CallbackHandler(BaseHTTPRequestHandler):
         pass  # suppress request logs
 
 
+# How long to wait for the browser to hit the callback before giving up.
+_LOGIN_TIMEOUT = 300
+
+
 def _find_free_port() -> int:
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(("", 0))
@@ -79,17 +91,23 @@ def login(token, email, no_browser):
     _CallbackHandler.email = None
 
     server = HTTPServer(("localhost", port), _CallbackHandler)
+    server.done = threading.Event()
 
     login_url = f"{web_url}?auth_redirect={callback_url}"
     click.echo(f"Opening browser for login...")
     click.echo(f"If the browser doesn't open, visit: {login_url}")
     webbrowser.open(login_url)
 
-    # Wait for callback
-    while _CallbackHandler.token is None:
-        server.handle_request()
-
-    server.server_close()
+    # Wait for callback; the handler sets `done` once a token arrives
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        received = server.done.wait(timeout=_LOGIN_TIMEOUT)
+    finally:
+        server.shutdown()
+        server.server_close()
+    if not received:
+        click.echo(f"Timed out after {_LOGIN_TIMEOUT}s waiting for the login callback.")
+        raise click.Abort()
 
     save_auth(_CallbackHandler.token, _CallbackHandler.email, web_url)
     click.echo(f"Logged in as {_CallbackHandler.email}")
@@ -1,13 +1,21 @@
 import datetime as _dt
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import click
+import yaml
 
 from yagent.api_client import api_request
 
+# LibYAML-backed loader when PyYAML was built with it; same safe subset.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 BASE_DIR = "/Users/roy/luohy15"
 
+# Files are independent: overlap their reads and API round trips.
+_IMPORT_WORKERS = 8
+
 
 def _json_safe(value):
     """Coerce YAML-parsed values into JSON-serialisable equivalents."""
@@ -20,16 +28,66 @@ def _json_safe(value):
     return value
 
 
+# A value YAML would resolve to the same plain string: starts with a letter
+# (so never a number, date or special float) and has no indicator characters.
+_PLAIN_VALUE_RE = re.compile(r"[A-Za-z][^:#'\"{}\[\],&*!|>%@`]*")
+_YAML_RESERVED = frozenset(
+    w for word in ("yes", "no", "true", "false", "on", "off", "null")
+    for w in (word, word.capitalize(), word.upper())
+)
+
+
+def _parse_flat_front_matter(lines):
+    """Parse a flat ``key: plain value`` header without YAML.
+
+    Returns None as soon as a line needs real YAML (indentation, lists,
+    quotes, flow/block syntax, non-string scalars) so the caller falls back.
+    """
+    out = {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if line[0] in " \t":
+            return None
+        key, sep, value = stripped.partition(":")
+        value = value.strip()
+        if (
+            not sep
+            or not key.isidentifier()
+            or key in _YAML_RESERVED
+            or value in _YAML_RESERVED
+            or not _PLAIN_VALUE_RE.fullmatch(value)
+        ):
+            return None
+        out[key] = value
+    return out
+
+
 def _parse_front_matter(filepath):
     """Parse YAML front matter from a markdown file. Returns dict or None."""
+    # Read only the header lines up to the closing '---'; the note body is
+    # never loaded or scanned.
     with open(filepath, "r") as f:
-        text = f.read()
-    match = re.match(r"^---\n(.*?)\n---", text, re.DOTALL)
-    if not match:
+        if f.readline() != "---\n":
+            return None
+        header = []
+        for line in f:
+            if line.startswith("---"):
+                break
+            header.append(line)
+        else:
+            return None
+    raw = "".join(header)
+    if not raw.strip():
         return None
+    # Most headers are a handful of flat `key: text` lines; only hand the
+    # rest to the YAML loader.
+    flat = _parse_flat_front_matter(header)
+    if flat is not None:
+        return flat or None
     try:
-        import yaml
-        parsed = yaml.safe_load(match.group(1))
+        parsed = yaml.load(raw, Loader=_YamlLoader)
     except Exception:
         return None
     if not isinstance(parsed, dict):
@@ -62,7 +120,10 @@ def import_single(filepath):
 @click.argument("paths", nargs=-1, required=True)
 def note_import(paths):
     """Import one or more markdown files as notes."""
-    for filepath in paths:
-        content_key, note_id = import_single(filepath)
-        if note_id:
-            click.echo(f"Imported: {content_key} -> {note_id}")
+    # Dedupe so the same note is never upserted by two workers at once.
+    paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=min(_IMPORT_WORKERS, len(paths))) as pool:
+        # map() yields in input order, so output order is unchanged
+        for content_key, note_id in pool.map(import_single, paths):
+            if note_id:
+                click.echo(f"Imported: {content_key} -> {note_id}")
@@ -1,8 +1,6 @@
 from pathlib import Path
 
 import click
-import pymupdf
-import pymupdf4llm
 
 
 @click.command('parse')
@@ -24,6 +22,11 @@ def pdf_parse(input_pdf: Path, output: Path | None):
         output = Path('assets/pdf') / f"{input_pdf.stem}.md"
     output.parent.mkdir(parents=True, exist_ok=True)
 
+    # Imported here: pymupdf4llm's layout module takes ~0.5s to load, which
+    # every other `y` command would otherwise pay at startup.
+    import pymupdf
+    import pymupdf4llm
+
     try:
         doc = pymupdf.open(str(input_pdf))
     except Exception as e:
@@ -1,11 +1,16 @@
 import click
 from yagent.api_client import api_request
+from .status import bulk_set_status
 
 
 @click.command('activate')
-@click.argument('todo_id')
-def todo_activate(todo_id):
-    """Set a todo to active status."""
-    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_id, "status": "active"})
+@click.argument('todo_ids', nargs=-1, required=True)
+def todo_activate(todo_ids):
+    """Set todos to active status (several IDs go in one request)."""
+    if len(todo_ids) > 1:
+        count = bulk_set_status(todo_ids, "active")
+        click.echo(f"Activated {count} of {len(todo_ids)} todos")
+        return
+    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_ids[0], "status": "active"})
     todo = resp.json()
     click.echo(f"Activated todo '{todo['name']}' ({todo['todo_id']})")
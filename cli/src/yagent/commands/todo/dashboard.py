@@ -1,9 +1,10 @@
 """Generate todo.md dashboard at $Y_AGENT_HOME/todo.md."""
 
+import heapq
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from yagent.api_client import api_request
+from yagent.api_client import api_request, response_json
 
 
 def _agent_home() -> str:
@@ -16,7 +17,7 @@ def update_dashboard():
 
     # Fetch all non-deleted todos
     resp = api_request("GET", "/api/todo/list", params={"limit": 500})
-    all_todos = resp.json()
+    all_todos = response_json(resp)
 
     # Active task (current)
     active = [t for t in all_todos if t["status"] == "active"]
@@ -28,7 +29,7 @@ def update_dashboard():
     for t in all_todos:
         if t.get("due_date") and t["status"] in ("pending", "active"):
             try:
-                due = datetime.strptime(t["due_date"], "%Y-%m-%d").date()
+                due = date.fromisoformat(t["due_date"])
                 if due <= two_weeks:
                     urgent.append(t)
             except ValueError:
@@ -38,25 +39,17 @@ def update_dashboard():
     # Important: high priority, not completed/deleted
     important = [t for t in all_todos if t.get("priority") == "high" and t["status"] in ("pending", "active")]
 
-    # Recent operations: collect from history across all todos (including completed)
-    resp_completed = api_request("GET", "/api/todo/list", params={"status": "completed", "limit": 100})
-    completed = resp_completed.json()
-    all_with_completed = list(all_todos)
-    all_with_completed.extend(completed)
-    seen_ids = set()
-    deduped = []
-    for t in all_with_completed:
-        if t["todo_id"] not in seen_ids:
-            seen_ids.add(t["todo_id"])
-            deduped.append(t)
-
-    recent_ops = []
-    for t in deduped:
-        if t.get("history"):
-            for h in t["history"]:
-                recent_ops.append((h["timestamp"], h["action"], t["name"], t["todo_id"], h.get("note")))
-    recent_ops.sort(key=lambda x: x[0], reverse=True)
-    recent_ops = recent_ops[:10]
+    # Recent operations: collect from history across all todos. The unfiltered
+    # list already includes completed todos, most recently updated first.
+    recent_ops = heapq.nlargest(
+        10,
+        (
+            (h["timestamp"], h["action"], t["name"], t["todo_id"], h.get("note"))
+            for t in all_todos
+            for h in t.get("history") or ()
+        ),
+        key=lambda x: x[0],
+    )
 
     # Build markdown
     lines = ["# Todo Dashboard", ""]
@@ -78,8 +71,7 @@ def update_dashboard():
         lines.append("")
         lines.append("| Name | Due | Priority | ID |")
         lines.append("|------|-----|----------|----|")
-        for t in urgent:
-            lines.append(f"| {t['name']} | {t['due_date']} | {t.get('priority') or '-'} | {t['todo_id']} |")
+        lines.extend(f"| {t['name']} | {t['due_date']} | {t.get('priority') or '-'} | {t['todo_id']} |" for t in urgent)
     else:
         lines.append("")
         lines.append("_No urgent tasks._")
@@ -91,8 +83,7 @@ def update_dashboard():
         lines.append("")
         lines.append("| Name | Status | Due | ID |")
         lines.append("|------|--------|-----|----|")
-        for t in important:
-            lines.append(f"| {t['name']} | {t['status']} | {t.get('due_date') or '-'} | {t['todo_id']} |")
+        lines.extend(f"| {t['name']} | {t['status']} | {t.get('due_date') or '-'} | {t['todo_id']} |" for t in important)
     else:
         lines.append("")
         lines.append("_No high-priority tasks._")
@@ -104,9 +95,7 @@ def update_dashboard():
         lines.append("")
         lines.append("| Time | Action | Task | Note |")
         lines.append("|------|--------|------|------|")
-        for ts, action, name, tid, note in recent_ops:
-            note_str = note or ""
-            lines.append(f"| {ts} | {action} | {name} | {note_str} |")
+        lines.extend(f"| {ts} | {action} | {name} | {note or ''} |" for ts, action, name, tid, note in recent_ops)
     else:
         lines.append("")
         lines.append("_No recent operations._")
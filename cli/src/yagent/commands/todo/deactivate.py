@@ -1,11 +1,16 @@
 import click
 from yagent.api_client import api_request
+from .status import bulk_set_status
 
 
 @click.command('deactivate')
-@click.argument('todo_id')
-def todo_deactivate(todo_id):
-    """Set a todo back to pending status."""
-    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_id, "status": "pending"})
+@click.argument('todo_ids', nargs=-1, required=True)
+def todo_deactivate(todo_ids):
+    """Set todos back to pending status (several IDs go in one request)."""
+    if len(todo_ids) > 1:
+        count = bulk_set_status(todo_ids, "pending")
+        click.echo(f"Deactivated {count} of {len(todo_ids)} todos")
+        return
+    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_ids[0], "status": "pending"})
     todo = resp.json()
     click.echo(f"Deactivated todo '{todo['name']}' ({todo['todo_id']})")
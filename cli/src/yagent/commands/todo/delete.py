@@ -1,11 +1,16 @@
 import click
 from yagent.api_client import api_request
+from .status import bulk_set_status
 
 
 @click.command('delete')
-@click.argument('todo_id')
-def todo_delete(todo_id):
-    """Soft delete a todo."""
-    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_id, "status": "deleted"})
+@click.argument('todo_ids', nargs=-1, required=True)
+def todo_delete(todo_ids):
+    """Soft delete todos (several IDs go in one request)."""
+    if len(todo_ids) > 1:
+        count = bulk_set_status(todo_ids, "deleted")
+        click.echo(f"Deleted {count} of {len(todo_ids)} todos")
+        return
+    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_ids[0], "status": "deleted"})
     todo = resp.json()
     click.echo(f"Deleted todo '{todo['name']}' ({todo['todo_id']})")
@@ -1,11 +1,16 @@
 import click
 from yagent.api_client import api_request
+from .status import bulk_set_status
 
 
 @click.command('finish')
-@click.argument('todo_id')
-def todo_finish(todo_id):
-    """Mark a todo as completed."""
-    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_id, "status": "completed"})
+@click.argument('todo_ids', nargs=-1, required=True)
+def todo_finish(todo_ids):
+    """Mark todos as completed (several IDs go in one request)."""
+    if len(todo_ids) > 1:
+        count = bulk_set_status(todo_ids, "completed")
+        click.echo(f"Completed {count} of {len(todo_ids)} todos")
+        return
+    resp = api_request("POST", "/api/todo/status", json={"todo_id": todo_ids[0], "status": "completed"})
     todo = resp.json()
     click.echo(f"Completed todo '{todo['name']}' ({todo['todo_id']})")
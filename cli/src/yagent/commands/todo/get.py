@@ -1,5 +1,5 @@
 import click
-from yagent.api_client import api_request
+from yagent.api_client import api_request, response_json
 
 
 @click.command('get')
@@ -7,7 +7,7 @@ from yagent.api_client import api_request
 def todo_get(todo_id):
     """Show todo details."""
     resp = api_request("GET", "/api/todo/detail", params={"todo_id": todo_id})
-    todo = resp.json()
+    todo = response_json(resp)
 
     click.echo(f"ID:        {todo['todo_id']}")
     click.echo(f"Name:      {todo['name']}")
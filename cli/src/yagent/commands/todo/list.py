@@ -1,6 +1,6 @@
 import click
 from tabulate import tabulate
-from yagent.api_client import api_request
+from yagent.api_client import api_request, response_json
 from yagent.time_filter import collect_time_params, time_filter_options
 
 
@@ -27,20 +27,20 @@ def todo_list(status, priority, tag, on, from_, to, created_on, created_from, cr
     ))
 
     resp = api_request("GET", "/api/todo/list", params=params)
-    todos = resp.json()
+    todos = response_json(resp)
     if not todos:
         click.echo("No todos found")
         return
 
-    table = []
-    for t in todos:
-        pin_marker = "[P] " if t.get("pinned") else ""
-        table.append([
+    table = [
+        (
             t["todo_id"],
-            f"{pin_marker}{t['name']}",
+            f"{'[P] ' if t.get('pinned') else ''}{t['name']}",
             t["status"],
             t.get("priority") or "-",
             t.get("due_date") or "-",
             ",".join(t["tags"]) if t.get("tags") else "-",
-        ])
+        )
+        for t in todos
+    ]
     click.echo(tabulate(table, headers=["ID", "Name", "Status", "Priority", "Due", "Tags"], tablefmt="simple"))
@@ -2,6 +2,12 @@ import click
 from yagent.api_client import api_request
 
 
+def bulk_set_status(todo_ids, status) -> int:
+    """Set the status of several todos in one request. Returns how many exist."""
+    resp = api_request("POST", "/api/todo/bulk_update", json={"todo_ids": list(todo_ids), "status": status})
+    return resp.json()["count"]
+
+
 @click.command('status')
 @click.argument('todo_id')
 @click.argument('status')
@@ -2,12 +2,18 @@
 
 import os
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 
 
 def _get_configured_tz():
     """Return the configured timezone, falling back to system local."""
+    return _resolve_tz(os.getenv("Y_AGENT_TIMEZONE"))
+
+
+@lru_cache(maxsize=8)
+def _resolve_tz(tz_name):
+    """Resolve a tz name once; list commands convert every row through here."""
     from dateutil import tz as dateutil_tz
-    tz_name = os.getenv("Y_AGENT_TIMEZONE")
     if tz_name:
         tz = dateutil_tz.gettz(tz_name)
         if tz:
@@ -17,8 +23,8 @@ def _get_configured_tz():
 
 def utc_to_local(utc_str: str) -> str:
     """Convert UTC ISO 8601 string to local datetime string."""
-    utc_str_clean = utc_str.replace("Z", "+00:00")
-    dt = datetime.fromisoformat(utc_str_clean)
+    # fromisoformat accepts the trailing "Z" natively on 3.11+
+    dt = datetime.fromisoformat(utc_str)
     local_dt = dt.astimezone(_get_configured_tz())
     return local_dt.strftime("%Y-%m-%d %H:%M")
 
@@ -10,7 +10,7 @@ from storage.global_config import load_global_config
 load_dotenv()
 load_global_config()
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from storage.entity.base import Base
@@ -91,6 +91,13 @@ def init_tables():
 
     Base.metadata.create_all(bind=_engine)
 
+    # create_all only builds indexes along with a new table; add ones declared
+    # after their table already existed.
+    with _engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_calendar_event_user_start ON calendar_event (user_id, start_time)"
+        ))
+
 
 @contextmanager
 def get_db() -> Session:
@@ -9,7 +9,7 @@ _INVISIBLE_RE = re.compile(
     '\u200b-\u200f\u2028-\u202f\u2060-\u206f\ufeff\ufff9-\ufffc]'
 )
 
-def _strip_invisible(s: str) -> str:
+def strip_invisible(s: str) -> str:
     return _INVISIBLE_RE.sub('', s)
 
 @dataclass
@@ -50,12 +50,12 @@ class Message:
 
         content = data['content']
         if isinstance(content, str):
-            content = _strip_invisible(content)
+            content = strip_invisible(content)
         elif isinstance(content, list):
             content = [ContentPart(**part) if isinstance(part, dict) else part for part in content]
             for part in content:
                 if isinstance(part, ContentPart):
-                    part.text = _strip_invisible(part.text)
+                    part.text = strip_invisible(part.text)
 
         return cls(
             role=data['role'],
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, UniqueConstraint, Index
 from .base import Base, BaseEntity
 
 
@@ -21,4 +21,5 @@ class CalendarEventEntity(Base, BaseEntity):
 
     __table_args__ = (
         UniqueConstraint("user_id", "event_id"),
+        Index("ix_calendar_event_user_start", "user_id", "start_time"),
     )
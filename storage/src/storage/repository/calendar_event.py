@@ -101,6 +101,49 @@ def save_event(user_id: int, event: CalendarEvent) -> CalendarEvent:
         return _entity_to_dto(entity)
 
 
+def save_events_batch(user_id: int, events: List[CalendarEvent]) -> int:
+    """Upsert events by event_id in one transaction. Returns count saved.
+
+    Like save_event per item, a later event with the same event_id overwrites
+    an earlier one.
+    """
+    if not events:
+        return 0
+
+    with get_db() as session:
+        event_ids = list({e.event_id for e in events})
+        entities = {
+            row.event_id: row
+            for row in session.query(CalendarEventEntity).filter(
+                CalendarEventEntity.user_id == user_id,
+                CalendarEventEntity.event_id.in_(event_ids),
+            )
+        }
+        for event in events:
+            fields = dict(
+                source_id=event.source_id,
+                summary=event.summary,
+                description=event.description,
+                start_time=event.start_time,
+                end_time=event.end_time,
+                all_day=event.all_day,
+                status=event.status,
+                source=event.source,
+                todo_id=event.todo_id,
+                deleted_at=event.deleted_at,
+            )
+            entity = entities.get(event.event_id)
+            if entity:
+                for k, v in fields.items():
+                    setattr(entity, k, v)
+            else:
+                entity = CalendarEventEntity(user_id=user_id, event_id=event.event_id, **fields)
+                session.add(entity)
+                entities[event.event_id] = entity
+
+    return len(events)
+
+
 def list_deleted_events(user_id: int, limit: int = 50) -> List[CalendarEvent]:
     with get_db() as session:
         query = (
@@ -397,24 +397,43 @@ def find_running_chat_ids_older_than(cutoff_unix: int, limit: int = 100) -> List
 
 
 def list_trace_ids(user_id: int, limit: int = 50, offset: int = 0, trace_id: str = None) -> list:
-    """List distinct trace_ids, ordered by most recently updated."""
-    from sqlalchemy import func
+    """List distinct trace_ids, ordered by most recently updated.
+
+    Each trace is LEFT JOINed to its todo (trace_id = todo_id) in the same
+    statement, so rows carry ``todo_name``/``todo_status`` (None when the
+    trace has no todo) without a second lookup.
+    """
+    from sqlalchemy import and_, func
+    from storage.entity.todo import TodoEntity
     with get_db() as session:
         q = (session.query(
                 ChatEntity.trace_id,
                 func.max(ChatEntity.updated_at).label("updated_at"),
+                func.max(ChatEntity.updated_at_unix).label("updated_at_unix"),
              )
              .filter_by(user_id=user_id)
              .filter(ChatEntity.trace_id.isnot(None)))
         if trace_id:
             q = q.filter(ChatEntity.trace_id.contains(trace_id))
-        rows = (q.group_by(ChatEntity.trace_id)
-                 .order_by(func.max(ChatEntity.updated_at_unix).desc())
-                 .offset(offset)
-                 .limit(limit)
-                 .all())
+        traces = (q.group_by(ChatEntity.trace_id)
+                   .order_by(func.max(ChatEntity.updated_at_unix).desc())
+                   .offset(offset)
+                   .limit(limit)
+                   .subquery())
+        rows = (session.query(traces.c.trace_id, traces.c.updated_at, TodoEntity.name, TodoEntity.status)
+                .outerjoin(TodoEntity, and_(
+                    TodoEntity.user_id == user_id,
+                    TodoEntity.todo_id == traces.c.trace_id,
+                ))
+                .order_by(traces.c.updated_at_unix.desc())
+                .all())
         return [
-            {"trace_id": row.trace_id, "updated_at": row.updated_at or ""}
+            {
+                "trace_id": row.trace_id,
+                "updated_at": row.updated_at or "",
+                "todo_name": row.name,
+                "todo_status": row.status,
+            }
             for row in rows
         ]
 
@@ -1,7 +1,7 @@
 """Function-based todo repository using SQLAlchemy sessions."""
 
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import Callable, List, Optional
 from sqlalchemy import case, func
 from storage.entity.todo import TodoEntity
 from storage.entity.chat import ChatEntity
@@ -19,6 +19,18 @@ _PRIORITY_ORDER = case(
 )
 
 
+# Columns _entity_to_dto reads. Read-only list queries select these as plain
+# rows instead of full ORM entities, skipping identity-map and attribute
+# instrumentation work per todo; Row exposes the same attribute names.
+_DTO_COLUMNS = (
+    TodoEntity.todo_id, TodoEntity.name, TodoEntity.desc, TodoEntity.tags,
+    TodoEntity.due_date, TodoEntity.priority, TodoEntity.pinned, TodoEntity.status,
+    TodoEntity.progress, TodoEntity.completed_at, TodoEntity.history,
+    TodoEntity.created_at, TodoEntity.updated_at,
+    TodoEntity.created_at_unix, TodoEntity.updated_at_unix,
+)
+
+
 def _entity_to_dto(entity: TodoEntity) -> Todo:
     history = entity.history or []
     return Todo(
@@ -74,7 +86,7 @@ def list_todos(
         )
         effective_updated = func.coalesce(chat_max.c.max_updated, TodoEntity.updated_at_unix)
 
-        q = (session.query(TodoEntity)
+        q = (session.query(*_DTO_COLUMNS)
              .outerjoin(chat_max, chat_max.c.tid == TodoEntity.todo_id)
              .filter(TodoEntity.user_id == user_id))
         if status:
@@ -167,21 +179,31 @@ def get_todo(user_id: int, todo_id: str) -> Optional[Todo]:
         return None
 
 
+def todo_exists(user_id: int, todo_id: str) -> bool:
+    with get_db() as session:
+        row = session.query(TodoEntity.id).filter_by(user_id=user_id, todo_id=todo_id).first()
+        return row is not None
+
+
+def _entity_fields(todo: Todo) -> dict:
+    return dict(
+        name=todo.name,
+        desc=todo.desc,
+        tags=todo.tags,
+        due_date=todo.due_date,
+        priority=todo.priority,
+        pinned=todo.pinned,
+        status=todo.status,
+        progress=todo.progress,
+        completed_at=todo.completed_at,
+        history=[h.to_dict() for h in (todo.history or [])],
+    )
+
+
 def save_todo(user_id: int, todo: Todo) -> Todo:
     with get_db() as session:
         entity = session.query(TodoEntity).filter_by(user_id=user_id, todo_id=todo.todo_id).first()
-        fields = dict(
-            name=todo.name,
-            desc=todo.desc,
-            tags=todo.tags,
-            due_date=todo.due_date,
-            priority=todo.priority,
-            pinned=todo.pinned,
-            status=todo.status,
-            progress=todo.progress,
-            completed_at=todo.completed_at,
-            history=[h.to_dict() for h in (todo.history or [])],
-        )
+        fields = _entity_fields(todo)
         if entity:
             for k, v in fields.items():
                 setattr(entity, k, v)
@@ -192,11 +214,29 @@ def save_todo(user_id: int, todo: Todo) -> Todo:
         return _entity_to_dto(entity)
 
 
+def modify_todo(user_id: int, todo_id: str, mutate: Callable[[Todo], None]) -> Optional[Todo]:
+    """Load a todo, apply `mutate` to it and write it back in one transaction.
+
+    Saves the separate get_todo + save_todo sessions (and save_todo's second
+    SELECT) for read-modify-write updates. Returns None if the todo is missing.
+    """
+    with get_db() as session:
+        entity = session.query(TodoEntity).filter_by(user_id=user_id, todo_id=todo_id).first()
+        if not entity:
+            return None
+        todo = _entity_to_dto(entity)
+        mutate(todo)
+        for k, v in _entity_fields(todo).items():
+            setattr(entity, k, v)
+        session.flush()
+        return _entity_to_dto(entity)
+
+
 def find_todos_by_ids(user_id: int, todo_ids: List[str]) -> dict:
     """Return {todo_id: Todo} for the given IDs."""
     with get_db() as session:
-        rows = (session.query(TodoEntity)
-                .filter_by(user_id=user_id)
+        rows = (session.query(*_DTO_COLUMNS)
+                .filter(TodoEntity.user_id == user_id)
                 .filter(TodoEntity.todo_id.in_(todo_ids))
                 .all())
         return {row.todo_id: _entity_to_dto(row) for row in rows}
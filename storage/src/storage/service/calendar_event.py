@@ -1,9 +1,9 @@
 """Calendar event service."""
 
 import os
-import glob as globmod
 from datetime import datetime, timezone
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional
 from storage.entity.dto import CalendarEvent
 from storage.repository import calendar_event as event_repo
 from storage.repository import todo as todo_repo
@@ -14,16 +14,19 @@ def _resolve_todo_id(user_id: int, todo_id: Optional[str]) -> Optional[str]:
     """Validate todo_id exists and return it. Raises ValueError if not found."""
     if todo_id is None:
         return None
-    todo = todo_repo.get_todo(user_id, todo_id)
-    if not todo:
+    if not todo_repo.todo_exists(user_id, todo_id):
         raise ValueError(f"Todo '{todo_id}' not found")
     return todo_id
 
 
 def _get_configured_tz():
     """Return the configured timezone, falling back to system local."""
+    return _resolve_tz(os.getenv("Y_AGENT_TIMEZONE"))
+
+
+@lru_cache(maxsize=8)
+def _resolve_tz(tz_name: Optional[str]):
     from dateutil import tz as dateutil_tz
-    tz_name = os.getenv("Y_AGENT_TIMEZONE")
     if tz_name:
         tz = dateutil_tz.gettz(tz_name)
         if tz:
@@ -37,6 +40,10 @@ def _local_to_utc(local_str: str) -> str:
     Accepts formats: 'YYYY-MM-DDTHH:MM:SS', 'YYYY-MM-DDTHH:MM', 'YYYY-MM-DD'.
     Uses Y_AGENT_TIMEZONE env var if set, otherwise system local timezone.
     """
+    # Already UTC ISO 8601 with Z suffix (none of the formats below can
+    # match it): return as-is without three failed strptime attempts.
+    if local_str.endswith("Z"):
+        return local_str
     local_tz = _get_configured_tz()
     for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
         try:
@@ -46,9 +53,6 @@ def _local_to_utc(local_str: str) -> str:
             return utc_dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{utc_dt.microsecond // 1000:03d}Z"
         except ValueError:
             continue
-    # If already UTC ISO 8601 with Z suffix, return as-is
-    if local_str.endswith("Z"):
-        return local_str
     raise ValueError(f"Cannot parse datetime: {local_str}")
 
 
@@ -57,8 +61,8 @@ def _utc_to_local(utc_str: str) -> str:
 
     Uses Y_AGENT_TIMEZONE env var if set, otherwise system local timezone.
     """
-    utc_str_clean = utc_str.replace("Z", "+00:00")
-    dt = datetime.fromisoformat(utc_str_clean)
+    # fromisoformat accepts the trailing "Z" natively on 3.11+
+    dt = datetime.fromisoformat(utc_str)
     local_dt = dt.astimezone(_get_configured_tz())
     return local_dt.strftime("%Y-%m-%d %H:%M")
 
@@ -168,60 +172,77 @@ def list_deleted_events(user_id: int, limit: int = 50) -> List[CalendarEvent]:
     return event_repo.list_deleted_events(user_id, limit=limit)
 
 
-def import_ics(user_id: int, ics_dir: str) -> int:
-    """Import ICS files from a directory. Returns count of imported events."""
+def parse_ics_file(filepath: str) -> List[CalendarEvent]:
+    """Parse one .ics file into CalendarEvents."""
     from icalendar import Calendar
 
-    count = 0
-    ics_files = globmod.glob(os.path.join(ics_dir, "*.ics"))
-    for filepath in ics_files:
-        with open(filepath, "rb") as f:
-            cal = Calendar.from_ical(f.read())
-        for component in cal.walk():
-            if component.name != "VEVENT":
-                continue
-            uid = str(component.get("UID", ""))
-            if not uid:
-                continue
-            summary = str(component.get("SUMMARY", ""))
-            description = str(component.get("DESCRIPTION", "")) or None
-            status = str(component.get("STATUS", "CONFIRMED"))
-            dtstart = component.get("DTSTART")
-            dtend = component.get("DTEND")
-
-            all_day = False
-            if dtstart:
-                dt_val = dtstart.dt
-                if isinstance(dt_val, datetime):
-                    start_str = dt_val.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
-                else:
-                    # date object = all-day event
-                    start_str = dt_val.strftime("%Y-%m-%dT00:00:00.000Z")
-                    all_day = True
+    with open(filepath, "rb") as f:
+        cal = Calendar.from_ical(f.read())
+    source_name = os.path.splitext(os.path.basename(filepath))[0]
+    events = []
+    for component in cal.walk():
+        if component.name != "VEVENT":
+            continue
+        uid = str(component.get("UID", ""))
+        if not uid:
+            continue
+        summary = str(component.get("SUMMARY", ""))
+        description = str(component.get("DESCRIPTION", "")) or None
+        status = str(component.get("STATUS", "CONFIRMED"))
+        dtstart = component.get("DTSTART")
+        dtend = component.get("DTEND")
+
+        all_day = False
+        if dtstart:
+            dt_val = dtstart.dt
+            if isinstance(dt_val, datetime):
+                start_str = dt_val.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+            else:
+                # date object = all-day event
+                start_str = dt_val.strftime("%Y-%m-%dT00:00:00.000Z")
+                all_day = True
+        else:
+            continue
+
+        end_str = None
+        if dtend:
+            dt_val = dtend.dt
+            if isinstance(dt_val, datetime):
+                end_str = dt_val.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
             else:
-                continue
-
-            end_str = None
-            if dtend:
-                dt_val = dtend.dt
-                if isinstance(dt_val, datetime):
-                    end_str = dt_val.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
-                else:
-                    end_str = dt_val.strftime("%Y-%m-%dT00:00:00.000Z")
-
-            source_name = os.path.splitext(os.path.basename(filepath))[0]
-
-            event = CalendarEvent(
-                event_id=uid,
-                source_id=uid,
-                summary=summary,
-                description=description if description else None,
-                start_time=start_str,
-                end_time=end_str,
-                all_day=all_day,
-                status=status,
-                source=source_name,
-            )
-            event_repo.save_event(user_id, event)
-            count += 1
-    return count
+                end_str = dt_val.strftime("%Y-%m-%dT00:00:00.000Z")
+
+        event = CalendarEvent(
+            event_id=uid,
+            source_id=uid,
+            summary=summary,
+            description=description if description else None,
+            start_time=start_str,
+            end_time=end_str,
+            all_day=all_day,
+            status=status,
+            source=source_name,
+        )
+        events.append(event)
+    return events
+
+
+def list_ics_files(ics_dir: str) -> List[str]:
+    """Paths of the .ics files in ics_dir."""
+    # Same files glob("*.ics") matched (dotfiles skipped), in one scandir pass
+    with os.scandir(ics_dir) as it:
+        return [
+            e.path for e in it
+            if e.name.endswith(".ics") and not e.name.startswith(".") and e.is_file()
+        ]
+
+
+def save_parsed_events(user_id: int, parsed: Iterable[List[CalendarEvent]]) -> int:
+    """Save events parsed per file (see `parse_ics_file`). Returns the count."""
+    # One transaction per file rather than one per event
+    return sum(event_repo.save_events_batch(user_id, events) for events in parsed)
+
+
+def import_ics(user_id: int, ics_dir: str) -> int:
+    """Import ICS files from a directory. Returns count of imported events."""
+    return save_parsed_events(user_id, map(parse_ics_file, list_ics_files(ics_dir)))
@@ -126,6 +126,16 @@ def append_message_sync(chat_id: str, message: Message) -> Chat:
     return _save_chat_by_id_sync(chat)
 
 
+def append_messages_sync(chat_id: str, messages: List[Message]) -> Chat:
+    """Append several messages to a chat with a single load/save (sync)."""
+    from storage.repository.chat import _get_chat_by_id_sync, _save_chat_by_id_sync
+    chat = _get_chat_by_id_sync(chat_id)
+    if not chat:
+        raise ValueError(f"Chat with id {chat_id} not found")
+    chat.messages.extend(messages)
+    return _save_chat_by_id_sync(chat)
+
+
 def save_messages_sync(chat_id: str, messages: List[Message]) -> Chat:
     """Replace all messages in a chat (sync). Used to persist in-place mutations like tool_call statuses."""
     from storage.repository.chat import _get_chat_by_id_sync, _save_chat_by_id_sync
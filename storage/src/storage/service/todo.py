@@ -4,7 +4,7 @@ from typing import List, Optional
 from storage.entity.dto import Todo, TodoHistoryEntry
 from storage.repository import todo as todo_repo
 from storage.repository import entity_tag as tag_repo
-from storage.util import get_utc_iso8601_timestamp, get_unix_timestamp
+from storage.util import get_message_timestamps, get_utc_iso8601_timestamp, get_unix_timestamp
 
 
 def list_todos(
@@ -111,19 +111,18 @@ def update_todo(user_id: int, todo_id: str, **fields) -> Optional[Todo]:
 
 
 def pin_todo(user_id: int, todo_id: str, pinned: bool) -> Optional[Todo]:
-    todo = todo_repo.get_todo(user_id, todo_id)
-    if not todo:
-        return None
-    todo.pinned = pinned
-    history = todo.history or []
-    action = "pinned" if pinned else "unpinned"
-    history.append(TodoHistoryEntry(
-        timestamp=get_utc_iso8601_timestamp(),
-        unix_timestamp=get_unix_timestamp(),
-        action=action,
-    ))
-    todo.history = history
-    return todo_repo.save_todo(user_id, todo)
+    def apply(todo: Todo) -> None:
+        todo.pinned = pinned
+        history = todo.history or []
+        action = "pinned" if pinned else "unpinned"
+        history.append(TodoHistoryEntry(
+            timestamp=get_utc_iso8601_timestamp(),
+            unix_timestamp=get_unix_timestamp(),
+            action=action,
+        ))
+        todo.history = history
+
+    return todo_repo.modify_todo(user_id, todo_id, apply)
 
 
 STATUS_ACTION = {
@@ -135,20 +134,21 @@ STATUS_ACTION = {
 
 
 def update_status(user_id: int, todo_id: str, status: str) -> Optional[Todo]:
-    todo = todo_repo.get_todo(user_id, todo_id)
-    if not todo:
-        return None
-    old_status = todo.status
-    todo.status = status
-    if status == "completed":
-        todo.completed_at = get_utc_iso8601_timestamp()
-    elif old_status == "completed":
-        todo.completed_at = None
-    action = STATUS_ACTION.get(status, status)
-    history = todo.history or []
-    history.append(TodoHistoryEntry(timestamp=get_utc_iso8601_timestamp(), unix_timestamp=get_unix_timestamp(), action=action))
-    todo.history = history
-    return todo_repo.save_todo(user_id, todo)
+    def apply(todo: Todo) -> None:
+        # One clock read so completed_at matches the history entry exactly
+        now, now_unix = get_message_timestamps()
+        old_status = todo.status
+        todo.status = status
+        if status == "completed":
+            todo.completed_at = now
+        elif old_status == "completed":
+            todo.completed_at = None
+        action = STATUS_ACTION.get(status, status)
+        history = todo.history or []
+        history.append(TodoHistoryEntry(timestamp=now, unix_timestamp=now_unix, action=action))
+        todo.history = history
+
+    return todo_repo.modify_todo(user_id, todo_id, apply)
 
 
 def bulk_update_todos(
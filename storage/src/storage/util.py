@@ -2,7 +2,7 @@ import os
 import re
 import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 from loguru import logger
 
@@ -108,6 +108,16 @@ def get_utc_iso8601_timestamp() -> str:
     now = datetime.now(timezone.utc)
     return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
 
+def get_message_timestamps() -> Tuple[str, int]:
+    """Get current time as (ISO 8601 string, 13-digit unix ms) from one clock read.
+
+    Message builders need both; one read keeps them consistent and skips the
+    datetime round trip. The string matches `get_utc_iso8601_timestamp`.
+    """
+    ms = time.time_ns() // 1_000_000
+    sec, rem = divmod(ms, 1000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)) + f".{rem:03d}Z", ms
+
 def generate_id() -> str:
     """Generate a unique ID (6 hex characters)."""
     import uuid
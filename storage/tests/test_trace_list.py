@@ -0,0 +1,64 @@
+"""Repository tests for storage.repository.chat.list_trace_ids: traces are
+grouped per trace_id, ordered by latest chat update, and carry their todo's
+name/status from the same LEFT JOIN.
+
+Runs against an isolated in-memory SQLite DB, same setup as test_entity_tag.
+"""
+
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import storage.database.base as dbbase
+from storage.entity.chat import ChatEntity
+from storage.entity.todo import TodoEntity
+from storage.repository.chat import list_trace_ids
+
+
+class ListTraceIdsTest(unittest.TestCase):
+    def setUp(self):
+        self._orig_engine = dbbase._engine
+        self._orig_session_local = dbbase._SessionLocal
+
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        dbbase.Base.metadata.create_all(bind=engine)
+        dbbase._engine = engine
+        dbbase._SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+        with dbbase.get_db() as session:
+            for chat_id, trace_id, unix in [
+                ("c1", "t-old", 100), ("c2", "t-new", 300), ("c3", "t-old", 200),
+                ("c4", None, 400), ("c5", "t-orphan", 250),
+            ]:
+                session.add(ChatEntity(
+                    user_id=1, chat_id=chat_id, trace_id=trace_id, json_content="{}",
+                    updated_at=f"ts-{unix}", updated_at_unix=unix,
+                ))
+            session.add(TodoEntity(user_id=1, todo_id="t-old", name="Old", status="completed"))
+            session.add(TodoEntity(user_id=1, todo_id="t-new", name="New", status="active"))
+            session.add(TodoEntity(user_id=2, todo_id="t-orphan", name="Other user", status="pending"))
+
+    def tearDown(self):
+        dbbase._engine = self._orig_engine
+        dbbase._SessionLocal = self._orig_session_local
+
+    def test_orders_by_latest_update_and_joins_todo(self):
+        self.assertEqual(list_trace_ids(1), [
+            {"trace_id": "t-new", "updated_at": "ts-300", "todo_name": "New", "todo_status": "active"},
+            {"trace_id": "t-orphan", "updated_at": "ts-250", "todo_name": None, "todo_status": None},
+            {"trace_id": "t-old", "updated_at": "ts-200", "todo_name": "Old", "todo_status": "completed"},
+        ])
+
+    def test_offset_limit_and_filter_apply_before_join(self):
+        self.assertEqual([t["trace_id"] for t in list_trace_ids(1, limit=1, offset=1)], ["t-orphan"])
+        self.assertEqual([t["trace_id"] for t in list_trace_ids(1, trace_id="old")], ["t-old"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,7 +15,7 @@ from worker.process_manager import (
     get_running_processes, try_acquire_lease, renew_lease,
     update_process_offset, complete_process, release_lease,
 )
-from worker.runner import message_callback, check_interrupted
+from worker.runner import message_callback, message_batch_callback, check_interrupted
 
 MAX_PROCESSES_PER_LAMBDA = 100
 IDLE_EXIT_SECONDS = 30
@@ -210,6 +210,9 @@ async def _tail_and_process(chat_id: str, proc: dict, lambda_req_id: str, deadli
     def _msg_callback(msg):
         message_callback(chat_id, msg)
 
+    def _msg_batch_callback(msgs):
+        message_batch_callback(chat_id, msgs)
+
     # Build steer checker. claude_code injects steer into the live stdin pipe;
     # codex/gemini_cli can't take a live steer, so their tailers return
     # status="steer" and the run is restarted via the backend resume command.
@@ -295,6 +298,7 @@ async def _tail_and_process(chat_id: str, proc: dict, lambda_req_id: str, deadli
             offset=offset,
             last_message_id=last_message_id,
             message_callback=_msg_callback,
+            message_batch_callback=_msg_batch_callback,
             check_interrupted_fn=_check_interrupted,
             check_deadline_fn=_check_deadline,
             ssh_client=client,
@@ -3,7 +3,9 @@
 import os
 import re
 import threading
+import time
 import uuid
+from typing import List
 
 from loguru import logger
 
@@ -105,6 +107,13 @@ def message_callback(chat_id: str, message: Message):
     chat_service.append_message_sync(chat_id, message)
 
 
+def message_batch_callback(chat_id: str, messages: List[Message]):
+    """Persist all messages converted from one stream line in one chat save."""
+    for message in messages:
+        logger.info("Event: role={} tool={} content_length={}", message.role, message.tool, len(message.content) if message.content else 0)
+    chat_service.append_messages_sync(chat_id, messages)
+
+
 def strip_artifact_fences_for_telegram(text: str) -> str:
     """Replace web-only artifact fences with compact Telegram placeholders."""
     if not text:
@@ -117,9 +126,23 @@ def strip_artifact_fences_for_telegram(text: str) -> str:
     return ARTIFACT_FENCE_RE.sub(replacement, text)
 
 
+# Tailers call check_interrupted for every stdout line and each check loads
+# the whole chat, so answers are reused briefly; a stop lands within the TTL.
+_INTERRUPT_TTL = 0.5
+_interrupt_cache: dict[str, tuple[float, bool]] = {}
+
+
 def check_interrupted(chat_id: str) -> bool:
+    now = time.monotonic()
+    cached = _interrupt_cache.get(chat_id)
+    if cached and now - cached[0] < _INTERRUPT_TTL:
+        return cached[1]
     c = chat_service.get_chat_by_id_sync(chat_id)
-    return c.interrupted if c else False
+    interrupted = c.interrupted if c else False
+    if len(_interrupt_cache) >= 1024:
+        _interrupt_cache.clear()
+    _interrupt_cache[chat_id] = (now, interrupted)
+    return interrupted
 
 
 def make_steer_checker(chat_id: str, initial_message_ids: set, previously_consumed: set = None):
@@ -418,12 +441,13 @@ async def _run_perplexity_inline(chat, chat_id: str, user_id: int, bot_config,
             topic=topic,
         )
     finally:
+        # Re-read to pick up the messages the callback appended, then clear
+        # running; the same object serves the post-run steps below.
         fresh = await chat_service.get_chat_by_id(chat_id)
         if fresh:
             fresh.running = False
             await chat_repo.save_chat_by_id(fresh)
 
-    fresh = await chat_service.get_chat_by_id(chat_id)
     if not fresh:
         return
 
@@ -463,12 +487,13 @@ async def _run_openai_inline(chat, chat_id: str, user_id: int, bot_config,
             topic=topic,
         )
     finally:
+        # Re-read to pick up the messages the callback appended, then clear
+        # running; the same object serves the post-run steps below.
         fresh = await chat_service.get_chat_by_id(chat_id)
         if fresh:
             fresh.running = False
             await chat_repo.save_chat_by_id(fresh)
 
-    fresh = await chat_service.get_chat_by_id(chat_id)
     if not fresh:
         return
 
@@ -529,6 +554,7 @@ async def run_chat(user_id: int, chat_id: str, bot_name: str = None, bot_tier: s
     chat.interrupted = False
     chat.running = True
     await chat_repo.save_chat_by_id(chat)
+    _interrupt_cache.pop(chat_id, None)
 
     # Send user message to Telegram immediately (before agent runs)
     try:
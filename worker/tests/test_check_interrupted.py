@@ -0,0 +1,33 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from worker import runner
+
+
+class CheckInterruptedTest(unittest.TestCase):
+    def setUp(self):
+        runner._interrupt_cache.clear()
+        self.addCleanup(runner._interrupt_cache.clear)
+
+    def test_reuses_answer_within_ttl(self):
+        with patch.object(runner.chat_service, "get_chat_by_id_sync",
+                          return_value=SimpleNamespace(interrupted=False)) as get_chat:
+            for _ in range(5):
+                self.assertFalse(runner.check_interrupted("chat-1"))
+        get_chat.assert_called_once_with("chat-1")
+
+    def test_rereads_after_ttl(self):
+        with patch.object(runner, "_INTERRUPT_TTL", 0), \
+                patch.object(runner.chat_service, "get_chat_by_id_sync",
+                             side_effect=[SimpleNamespace(interrupted=False), SimpleNamespace(interrupted=True)]):
+            self.assertFalse(runner.check_interrupted("chat-1"))
+            self.assertTrue(runner.check_interrupted("chat-1"))
+
+    def test_missing_chat_is_not_interrupted(self):
+        with patch.object(runner.chat_service, "get_chat_by_id_sync", return_value=None):
+            self.assertFalse(runner.check_interrupted("gone"))
+
+
+if __name__ == "__main__":
+    unittest.main()